@@ -0,0 +1,21 @@
+from allauth.account.adapter import DefaultAccountAdapter
+from allauth.core import context as allauth_context
+from django.contrib.sites.shortcuts import get_current_site
+
+from jobs.tasks import queue_email
+
+
+class AccountAdapter(DefaultAccountAdapter):
+    def send_mail(self, template_prefix, email, context):
+        """
+        Render the e-mail now and send it from the job queue. The job is part
+        of the current transaction, so nothing is sent unless it commits.
+        """
+        request = allauth_context.request
+        ctx = {
+            "request": request,
+            "email": email,
+            "current_site": get_current_site(request),
+        }
+        ctx.update(context)
+        queue_email(self.render_mail(template_prefix, email, ctx))
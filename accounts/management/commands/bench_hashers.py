@@ -0,0 +1,32 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+
+from sweasy import hashers
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure password hashes per second with the calibrated cost, hashed "
+        "in the request threads and in the process pool."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hashes', type=int, default=64)
+        parser.add_argument('--threads', type=int, default=8, help="Concurrent requests.")
+
+    def handle(self, hashes, threads, **options):
+        self.stdout.write(f"Calibrated iterations: {hashers.calibrated_iterations()}")
+        for label, workers in [('In threads', 0), ('Process pool', None)]:
+            overrides = {} if workers is None else {'PASSWORD_HASHING_WORKERS': workers}
+            with override_settings(**overrides):
+                hashers.warm_up()
+                started = time.perf_counter()
+                with ThreadPoolExecutor(threads) as executor:
+                    list(executor.map(make_password, ['top_secret'] * hashes))
+                elapsed = time.perf_counter() - started
+            rate = hashes / elapsed
+            self.stdout.write(f"{label}: {rate:.1f} hashes/s")
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.5 on 2026-10-18 10:37
+
+from django.db import migrations
+from django.utils import timezone
+
+
+def backfill_deactivated_at(apps, schema_editor):
+    """
+    Accounts deleted through `DestroyMeView` before 0008 were only made
+    inactive. Date them from now, so that they are purged once
+    `ACCOUNT_DELETION_DELAY` has passed, like the ones deleted since.
+    Only accounts with a verified e-mail address could have signed in to
+    delete themselves: inactive accounts without one, such as unfinished
+    registrations, are left undated and never purged.
+    """
+    User = apps.get_model('accounts', 'User')
+    EmailAddress = apps.get_model('account', 'EmailAddress')
+    verified = EmailAddress.objects.filter(verified=True).values('user_id')
+    User.objects.filter(
+        is_active=False, deactivated_at__isnull=True, pk__in=verified
+    ).update(deactivated_at=timezone.now())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0010_user_list_indexes'),
+        ('account', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_deactivated_at, migrations.RunPython.noop),
+    ]
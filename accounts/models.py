@@ -1,8 +1,18 @@
-from django.db import models
+from functools import partial
+
+from django.db import models, transaction
+from django.db.models import F, Q
+from django.db.models.functions import Lower
 from django.contrib.auth.models import AbstractUser
 
+from sweasy import revocation
+
 class User(AbstractUser):
     email = models.EmailField(unique=True)
+    # Carried by JWTs; tokens with an older version are revoked.
+    token_version = models.PositiveIntegerField(default=0, editable=False)
+    # Set when the user deletes their account; purged by a background job.
+    deactivated_at = models.DateTimeField(null=True, blank=True, editable=False)
     
     # TODO: Add:
     #
@@ -21,5 +31,25 @@ class User(AbstractUser):
     # - ...
     
     
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Registration looks both up, ignoring case; the admin user list
+            # filters e-mails by prefix.
+            models.Index(Lower('username'), name='accounts_user_username_lower'),
+            models.Index(Lower('email'), name='accounts_user_email_lower'),
+            # The admin user list filters on these, in id order. Active users
+            # are most of them, and best found by scanning the primary key.
+            models.Index(
+                fields=['id'], condition=Q(is_active=False), name='accounts_user_inactive_id'
+            ),
+            models.Index(fields=['date_joined'], name='accounts_user_date_joined'),
+        ]
+
     def __str__(self):
         return self.username
+
+    def revoke_tokens(self):
+        """Invalidate every token issued to this user so far."""
+        User.objects.filter(pk=self.pk).update(token_version=F('token_version') + 1)
+        self.refresh_from_db(fields=['token_version'])
+        transaction.on_commit(partial(revocation.revoke, self.pk, self.token_version))
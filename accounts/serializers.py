@@ -1,3 +1,5 @@
+from django.db.models import Q
+from django.db.models.functions import Lower
 from rest_framework import serializers
 from .models import User
 from allauth.account.adapter import get_adapter
@@ -6,9 +8,44 @@ from dj_rest_auth.registration.serializers import RegisterSerializer
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
-        fields = ['id', 'email', 'password', 'username']
+        fields = ['id', 'email', 'password', 'username', 'is_active', 'date_joined']
+        read_only_fields = ['is_active', 'date_joined']
         extra_kwargs = {'password': {'write_only': True}}
 
     def create(self, validated_data):
         user = User.objects.create_user(**validated_data)
-        return user
\ No newline at end of file
+        return user
+
+
+def is_registered(username, email):
+    """
+    Whether `username` or `email` is taken, ignoring case, in one query that
+    the lower(username) and lower(email) indexes answer.
+    """
+    return (
+        User.objects.alias(lower_username=Lower('username'), lower_email=Lower('email'))
+        .filter(Q(lower_username=username.lower()) | Q(lower_email=email.lower()))
+        .exists()
+    )
+
+
+class CustomRegisterSerializer(RegisterSerializer):
+    """
+    Check that the username and e-mail are free in one query, once the
+    fields are valid, instead of one query per field.
+    """
+
+    default_error_messages = {'duplicate': 'This account cannot be registered.'}
+
+    def validate_username(self, username):
+        # shallow: the format only, uniqueness is checked in validate().
+        return get_adapter().clean_username(username, shallow=True)
+
+    def validate_email(self, email):
+        return get_adapter().clean_email(email)
+
+    def validate(self, data):
+        data = super().validate(data)
+        if is_registered(data['username'], data['email']):
+            self.fail('duplicate')
+        return data
@@ -0,0 +1,39 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from sweasy import revocation
+from sweasy.authentication import USER_CLAIMS
+
+from .models import User
+
+# Fields whose change makes the claims of issued tokens stale.
+CLAIM_FIELDS = tuple(claim for claim in USER_CLAIMS if claim != "username")
+
+
+@receiver(pre_save, sender=User)
+def remember_claims(sender, instance, update_fields=None, **kwargs):
+    instance._previous_claims = None
+    if instance._state.adding or instance.pk is None:
+        return
+    if update_fields is not None and not set(update_fields) & set(CLAIM_FIELDS):
+        return
+    instance._previous_claims = (
+        sender.objects.filter(pk=instance.pk).values_list(*CLAIM_FIELDS).first()
+    )
+
+
+@receiver(post_save, sender=User)
+def revoke_stale_tokens(sender, instance, created, **kwargs):
+    previous = getattr(instance, "_previous_claims", None)
+    if previous is None:
+        return
+    if previous != tuple(getattr(instance, field) for field in CLAIM_FIELDS):
+        instance.revoke_tokens()
+
+
+@receiver(post_delete, sender=User)
+def revoke_deleted_user_tokens(sender, instance, **kwargs):
+    transaction.on_commit(partial(revocation.revoke, instance.pk))
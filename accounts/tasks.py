@@ -0,0 +1,24 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from jobs.registry import task
+
+from .models import User
+
+
+@task
+def purge_deactivated_users(batch_size=None):
+    """
+    Delete the users who deleted their account (see `DestroyMeView`) at
+    least `ACCOUNT_DELETION_DELAY` seconds ago, one short transaction per
+    batch.
+    """
+    batch_size = batch_size or settings.ACCOUNT_PURGE_BATCH_SIZE
+    cutoff = timezone.now() - timedelta(seconds=settings.ACCOUNT_DELETION_DELAY)
+    users = User.objects.filter(is_active=False, deactivated_at__lte=cutoff)
+    while ids := list(users.values_list("pk", flat=True)[:batch_size]):
+        with transaction.atomic():
+            User.objects.filter(pk__in=ids).delete()
@@ -0,0 +1,22 @@
+import functools
+
+from django.contrib.auth import password_validation
+
+
+@functools.cache
+def common_passwords(path):
+    """The passwords listed in `path`, read once per process."""
+    return frozenset(password_validation.CommonPasswordValidator(path).passwords)
+
+
+class CommonPasswordValidator(password_validation.CommonPasswordValidator):
+    """
+    Django's `CommonPasswordValidator`, sharing one frozen set of passwords
+    per list between every instance. The list is loaded at startup (see
+    `sweasy.hashers.warm_up()`), before servers fork their workers.
+    """
+
+    def __init__(self, password_list_path=None):
+        if password_list_path is None:
+            password_list_path = self.DEFAULT_PASSWORD_LIST_PATH
+        self.passwords = common_passwords(str(password_list_path))
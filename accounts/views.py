@@ -1,17 +1,47 @@
+import datetime
+import functools
+import logging
+import sys
+import time
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
 from django.db import transaction
+from django.db.models.functions import Lower
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.crypto import get_random_string
 from django.db.utils import IntegrityError
 from dj_rest_auth.registration.views import RegisterView
 from dj_rest_auth.views import IsAuthenticated
-from rest_framework import generics, status
+from rest_framework import generics, permissions, status
 from rest_framework.decorators import api_view
-from rest_framework.exceptions import ValidationError
+from rest_framework.exceptions import ParseError, ValidationError
 from rest_framework.response import Response
 from rest_framework.reverse import reverse
 
+from sweasy.pagination import KeysetPagination
 from .models import User
 from .serializers import UserSerializer
 from .constants import *
 
+logger = logging.getLogger(__name__)
+
+
+@functools.cache
+def password_hash_time():
+    """Seconds that hashing one password takes, measured once."""
+    started = time.perf_counter()
+    make_password(get_random_string(16))
+    return time.perf_counter() - started
+
+
+def registration_time():
+    """The least time a registration answered with the generic message takes."""
+    if settings.REGISTRATION_RESPONSE_TIME is not None:
+        return settings.REGISTRATION_RESPONSE_TIME
+    return 1.5 * password_hash_time()
+
 
 @api_view(["GET"])
 def api_root(request, format=None):
@@ -47,18 +77,22 @@ class CustomRegisterView(RegisterView):
             status=status.HTTP_400_BAD_REQUEST,
         )
 
-    @transaction.atomic
+    def __generic_201(self, deadline):
+        # Every generic answer takes as long, whether a user was created or
+        # the account already existed.
+        time.sleep(max(0, deadline - time.monotonic()))
+        return self.__created_details_201(GENERIC_REGISTRATION_MSG)
+
     def create(self, request, *args, **kwargs):
+        deadline = time.monotonic() + registration_time()
         try:
-            super().create(request, *args, **kwargs)
-        except IntegrityError as exc:
-            if "UNIQUE constraint failed: accounts_user.email" in str(exc):
-                return self.__created_details_201(GENERIC_REGISTRATION_MSG)
-            if "UNIQUE constraint failed: accounts_user.username" in str(exc):
-                return self.__created_details_201(GENERIC_REGISTRATION_MSG)
-
-            print("Unhandled IntegrityError", exc)
-            return self.__unhandled_exception_details_400(GENERIC_ERR_MSG)
+            # The user, their e-mail address and the confirmation e-mail job
+            # are written together or not at all.
+            with transaction.atomic():
+                super().create(request, *args, **kwargs)
+        except IntegrityError:
+            # Taken by a concurrent registration since the serializer checked.
+            return self.__generic_201(deadline)
         except ValidationError as exc:
             detail = exc.detail if isinstance(exc.detail, dict) else {}
 
@@ -80,13 +114,14 @@ class CustomRegisterView(RegisterView):
                     ERR_PASSWORD2_REQUIRED, CODE_PASSWORD2_REQUIRED
                 )
 
-            # This handles also duplicates fields
-            return self.__created_details_201(GENERIC_REGISTRATION_MSG)
-        except Exception as exc:
-            print("Unhandled exception: ", exc)
+            # This handles also duplicates fields, found before any password
+            # is hashed.
+            return self.__generic_201(deadline)
+        except Exception:
+            logger.exception("Unhandled exception during registration")
             return self.__unhandled_exception_details_400(GENERIC_ERR_MSG)
 
-        return self.__created_details_201(GENERIC_REGISTRATION_MSG)
+        return self.__generic_201(deadline)
 
 
 class DestroyMeView(generics.DestroyAPIView):
@@ -96,18 +131,97 @@ class DestroyMeView(generics.DestroyAPIView):
 
     def destroy(self, request, *args, **kwargs):
         request.user.is_active = False
-        request.user.save(update_fields=["is_active"])
+        request.user.deactivated_at = timezone.now()
+        request.user.save(update_fields=["is_active", "deactivated_at"])
         return Response(
             data={"detail": DESTROY_ME_MSG},
             status=status.HTTP_204_NO_CONTENT,
         )
 
 
+BOOLEANS = {"true": True, "1": True, "false": False, "0": False}
+
+
+def prefix_range(prefix):
+    """The bounds of the strings that start with `prefix`, for a range scan."""
+    last = ord(prefix[-1])
+    if last == sys.maxunicode:
+        return prefix, None
+    return prefix, prefix[:-1] + chr(last + 1)
+
+
+def parse_moment(value):
+    """An aware datetime from an ISO datetime, or a date (its midnight)."""
+    try:
+        moment = parse_datetime(value)
+        if moment is None:
+            day = parse_date(value)
+            if day is not None:
+                moment = datetime.datetime.combine(day, datetime.time.min)
+    except ValueError:
+        moment = None
+    if moment is None:
+        raise ParseError(f"Expected an ISO date or datetime, got {value!r}.")
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+class UserPagination(KeysetPagination):
+    ordering = ("id",)
+    page_size = 100
+    # Pages are streamed, see `UserList`.
+    max_page_size = 10_000
+
+
 class UserList(generics.ListCreateAPIView):
+    """
+    Users, for admins, in keyset pages ordered by id and streamed row by row,
+    as `UserSerializer` renders them.
+
+    Filters: `email` (a prefix, ignoring case), `is_active` (true or false),
+    and `date_joined_after` (inclusive) and `date_joined_before` (ISO dates
+    or datetimes). Each is served by an index of `User`.
+    """
+
     queryset = User.objects.all()
     serializer_class = UserSerializer
+    permission_classes = [permissions.IsAdminUser]
+    pagination_class = UserPagination
+
+    def filter_queryset(self, queryset):
+        params = self.request.query_params
+        email = params.get("email", "").lower()
+        if email:
+            lowest, highest = prefix_range(email)
+            queryset = queryset.alias(lower_email=Lower("email")).filter(
+                lower_email__gte=lowest
+            )
+            if highest is not None:
+                queryset = queryset.filter(lower_email__lt=highest)
+        if "is_active" in params:
+            is_active = BOOLEANS.get(params["is_active"].lower())
+            if is_active is None:
+                raise ParseError("Expected ?is_active=true or ?is_active=false.")
+            queryset = queryset.filter(is_active=is_active)
+        if "date_joined_after" in params:
+            queryset = queryset.filter(
+                date_joined__gte=parse_moment(params["date_joined_after"])
+            )
+        if "date_joined_before" in params:
+            queryset = queryset.filter(
+                date_joined__lt=parse_moment(params["date_joined_before"])
+            )
+        return queryset
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        return self.paginator.stream_paginated_response(
+            queryset, self.get_serializer(), request, self
+        )
 
 
 class UserDetail(generics.RetrieveUpdateDestroyAPIView):
     queryset = User.objects.all()
     serializer_class = UserSerializer
+    permission_classes = [permissions.IsAdminUser]
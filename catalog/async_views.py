@@ -0,0 +1,187 @@
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from django.views import View
+from rest_framework import exceptions
+from rest_framework.request import Request
+
+from catalog import cache, views
+from catalog.cache import CachedResponseMixin
+from catalog.conditional import ConditionalGetMixin
+from catalog.fast import (
+    BookValuesSerializer,
+    CategoryValuesSerializer,
+    ChapterDetailValuesSerializer,
+    ChapterValuesSerializer,
+)
+from catalog.models import Book, Category, Chapter
+from catalog.sparse import SparseQuerysetMixin
+from sweasy.authentication import StatelessJWTCookieAuthentication
+from sweasy.pagination import KeysetPagination
+from sweasy.renderers import dumps
+
+
+class AsyncAPIView(View):
+    """
+    The little of `GenericAPIView` that the async read views need: JWT
+    authentication, `IsAuthenticated`, JSON errors and JSON responses.
+    """
+
+    queryset = None
+    serializer_class = None
+    pagination_class = None
+    authentication_class = StatelessJWTCookieAuthentication
+    lookup_field = "pk"
+    lookup_url_kwarg = None
+
+    def get_queryset(self):
+        return self.queryset.all()
+
+    def get_serializer_class(self):
+        return self.serializer_class
+
+    async def authenticate(self, request):
+        authenticated = await self.authentication_class().aauthenticate(request)
+        if authenticated is None:
+            raise exceptions.NotAuthenticated()
+        request.user, request.auth = authenticated
+
+    def render(self, data, status=200):
+        return HttpResponse(dumps(data), status=status, content_type="application/json")
+
+    def handle_exception(self, exc):
+        if isinstance(exc.detail, (list, dict)):
+            data = exc.detail
+        else:
+            data = {"detail": exc.detail}
+        if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+            response = self.render(data, status=401)
+            response["WWW-Authenticate"] = self.authentication_class().authenticate_header(
+                self.request
+            )
+            return response
+        return self.render(data, status=exc.status_code)
+
+
+class AsyncReadView(
+    ConditionalGetMixin, CachedResponseMixin, SparseQuerysetMixin, AsyncAPIView
+):
+    """
+    Async twin of a read-only view of `catalog.views`, served without a
+    thread-pool hop under ASGI.
+
+    It renders the same bytes from the same `.values()` serializers, answers
+    with the same validators, and shares the response cache of its twin
+    (both are keyed on the class name), awaiting the async ORM throughout.
+    """
+
+    sync_view = None
+
+    async def get(self, request, *args, **kwargs):
+        self.request = Request(request)
+        try:
+            await self.authenticate(self.request)
+            return await self.respond(self.request)
+        except exceptions.APIException as exc:
+            return self.handle_exception(exc)
+
+    async def respond(self, request):
+        etag = last_modified = None
+        if self.is_conditional(request):
+            etag, last_modified = await self.aget_validators(request)
+            response = get_conditional_response(
+                request._request, etag=etag, last_modified=last_modified
+            )
+            if response is not None:
+                return self.add_validators(response, etag, last_modified)
+
+        versions = await cache.aget_versions(*self.get_cache_scopes())
+        key = self._cache_key(request, versions)
+        data = await cache.get_cache().aget(key)
+        await cache.arecord(hit=data is not None)
+        if data is not None:
+            status = "HIT"
+        else:
+            with cache.fill_context(versions):
+                data = await self.load(request)
+            await cache.get_cache().aset(key, data, settings.CATALOG_CACHE_TIMEOUT)
+            status = "MISS"
+
+        response = self.render(data)
+        response["X-Cache"] = status
+        if etag is not None:
+            self.add_validators(response, etag, last_modified)
+        return response
+
+    def add_validators(self, response, etag, last_modified):
+        response.headers.setdefault("ETag", etag)
+        response.headers.setdefault("Last-Modified", http_date(last_modified))
+        return response
+
+    async def load(self, request):
+        queryset = self.get_queryset()
+        context = {"request": request, "view": self}
+        serializer_class = self.get_serializer_class()
+
+        if self.lookup_field not in self.kwargs:
+            paginator = self.pagination_class()
+            rows = await paginator.apaginate_queryset(queryset, request, view=self)
+            data = await serializer_class(rows, many=True, context=context).adata()
+            return paginator.get_paginated_data(data)
+
+        try:
+            row = await queryset.aget(**{self.lookup_field: self.kwargs[self.lookup_field]})
+        except queryset.model.DoesNotExist:
+            raise exceptions.NotFound(
+                f"No {queryset.model._meta.object_name} matches the given query."
+            )
+        return await serializer_class(row, context=context).adata()
+
+
+class CategoryList(AsyncReadView):
+    sync_view = views.CategoryList
+    queryset = Category.objects.all()
+    serializer_class = CategoryValuesSerializer
+    cache_scope = "category"
+    pagination_class = KeysetPagination
+    ordering = ("id",)
+
+
+class CategoryDetail(AsyncReadView):
+    sync_view = views.CategoryDetail
+    queryset = Category.objects.all()
+    serializer_class = CategoryValuesSerializer
+    cache_scope = "category"
+
+
+class BookList(AsyncReadView):
+    sync_view = views.BookList
+    queryset = Book.objects.all()
+    serializer_class = BookValuesSerializer
+    cache_scope = "book"
+    pagination_class = KeysetPagination
+    ordering = ("number", "id")
+
+
+class BookDetail(AsyncReadView):
+    sync_view = views.BookDetail
+    queryset = Book.objects.all()
+    serializer_class = BookValuesSerializer
+    cache_scope = "book"
+
+
+class ChapterList(AsyncReadView):
+    sync_view = views.ChapterList
+    queryset = Chapter.objects.all()
+    serializer_class = ChapterValuesSerializer
+    cache_scope = "chapter"
+    pagination_class = KeysetPagination
+    ordering = ("number", "id")
+
+
+class ChapterDetail(AsyncReadView):
+    sync_view = views.ChapterDetail
+    queryset = Chapter.objects.all()
+    serializer_class = ChapterDetailValuesSerializer
+    cache_scope = "chapter"
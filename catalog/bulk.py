@@ -0,0 +1,98 @@
+from catalog import cache, content, search
+from catalog.models import Book, Category, Chapter, ChapterContent
+
+# Bulk writes skip model signals, so each helper recounts, bumps the cache
+# versions, compresses content and updates the search index the way
+# `catalog.signals` would have. Inside a transaction, the cache versions are
+# only bumped once it commits (see `cache.bump()`).
+
+
+def upsert_categories(rows):
+    """Insert or update categories by id. `rows` are dicts of field values."""
+    if not rows:
+        return []
+    categories = Category.objects.bulk_create(
+        [Category(**row) for row in rows],
+        update_conflicts=True,
+        unique_fields=['id'],
+        update_fields=['name', 'description', 'updated_at'],
+    )
+    cache.bump(
+        *(f'category:{category.pk}' for category in categories),
+        'list:category',
+    )
+    return categories
+
+
+def upsert_books(rows):
+    """Insert or update books by id. `rows` are dicts of field values."""
+    if not rows:
+        return []
+    previous_category_ids = set(
+        Book.objects.filter(pk__in=[row['id'] for row in rows])
+        .values_list('category_id', flat=True)
+    )
+    books = Book.objects.bulk_create(
+        [Book(**row) for row in rows],
+        update_conflicts=True,
+        unique_fields=['id'],
+        update_fields=['category', 'number', 'title', 'description', 'updated_at'],
+    )
+    category_ids = previous_category_ids | {book.category_id for book in books}
+    Category.objects.filter(pk__in=category_ids).recount_books()
+    cache.bump(
+        *(f'book:{book.pk}' for book in books),
+        *(f'category:{category_id}' for category_id in category_ids),
+        'list:book',
+        'list:category',
+    )
+    search.index_books(books)
+    return books
+
+
+def upsert_chapters(rows):
+    """
+    Insert or update chapters by ``(book, number)``, together with their
+    content. `rows` are dicts of `Chapter` field values plus ``content``.
+    """
+    if not rows:
+        return []
+    contents = [row.pop('content') for row in rows]
+    chapters = Chapter.objects.bulk_create(
+        [Chapter(**row) for row in rows],
+        update_conflicts=True,
+        unique_fields=['book', 'number'],
+        update_fields=['title', 'description', 'updated_at'],
+    )
+    ChapterContent.objects.bulk_create(
+        [
+            ChapterContent(chapter_id=chapter.pk, content=document)
+            for chapter, document in zip(chapters, contents)
+        ],
+        update_conflicts=True,
+        unique_fields=['chapter'],
+        update_fields=['content', 'updated_at'],
+    )
+    content.compress_contents([chapter.pk for chapter in chapters])
+
+    book_ids = {chapter.book_id for chapter in chapters}
+    Book.objects.filter(pk__in=book_ids).recount_chapters()
+    category_ids = set(
+        Book.objects.filter(pk__in=book_ids).values_list('category_id', flat=True)
+    )
+    cache.bump(
+        *(f'chapter:{chapter.pk}' for chapter in chapters),
+        *(f'book:{book_id}' for book_id in book_ids),
+        *(f'category:{category_id}' for category_id in category_ids),
+        'list:chapter',
+        'list:book',
+        'list:category',
+    )
+    search.get_backend().index(
+        'chapter',
+        [
+            (chapter.pk, search.chapter_fields(chapter.title, chapter.description, document))
+            for chapter, document in zip(chapters, contents)
+        ],
+    )
+    return chapters
@@ -0,0 +1,188 @@
+import contextlib
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework.response import Response
+
+from sweasy import routers
+
+HITS_KEY = "catalog:stats:hits"
+MISSES_KEY = "catalog:stats:misses"
+
+
+def _plain(data):
+    # Serializers emit `Hyperlink` strings that keep a reference to their
+    # model instance; pickling one calls `str()` on the instance, which may
+    # hit the database. Store plain values only.
+    if isinstance(data, dict):
+        return {key: _plain(value) for key, value in data.items()}
+    if isinstance(data, list):
+        return [_plain(value) for value in data]
+    if isinstance(data, str):
+        return str(data)
+    return data
+
+
+def get_cache():
+    return caches[settings.CATALOG_CACHE_ALIAS]
+
+
+def _version_key(scope):
+    return f"catalog:version:{scope}"
+
+
+def get_versions(*scopes):
+    """
+    Return the current version of each scope (e.g. ``"book:1"`` or
+    ``"list:book"``). Unknown scopes are seeded with the current time, so an
+    evicted version never comes back with a value that old entries used.
+    """
+    cache = get_cache()
+    keys = [_version_key(scope) for scope in scopes]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            versions[key] = _seed(cache, key)
+    return [versions[key] for key in keys]
+
+
+def _seed(cache, key):
+    # `add()`: a concurrent seed or bump that got there first wins.
+    now = time.time_ns()
+    if cache.add(key, now, timeout=None):
+        return now
+    return cache.get(key, now)
+
+
+async def _aseed(cache, key):
+    now = time.time_ns()
+    if await cache.aadd(key, now, timeout=None):
+        return now
+    return await cache.aget(key, now)
+
+
+async def aget_versions(*scopes):
+    """`get_versions()` for async views."""
+    cache = get_cache()
+    keys = [_version_key(scope) for scope in scopes]
+    versions = await cache.aget_many(keys)
+    for key in keys:
+        if key not in versions:
+            versions[key] = await _aseed(cache, key)
+    return [versions[key] for key in keys]
+
+
+def bump(*scopes, using=None):
+    """
+    Invalidate every cached response built from any of `scopes`, once the
+    current transaction on `using` commits (right away outside of one).
+    Bumping earlier would let a reader cache the rows as they were before
+    the commit under the new versions.
+    """
+
+    def set_versions():
+        now = time.time_ns()
+        get_cache().set_many(
+            {_version_key(scope): now for scope in scopes}, timeout=None
+        )
+
+    transaction.on_commit(set_versions, using=using)
+
+
+def fill_context(versions):
+    """
+    Where to read a response about to be cached under `versions` from: the
+    primary when one of them was bumped less than `DATABASE_REPLICA_LAG`
+    seconds ago, since a replica may not have the write yet and its data
+    would stay cached under the new version. A replica otherwise.
+    """
+    age = time.time_ns() - max(versions)
+    if age < settings.DATABASE_REPLICA_LAG * 1_000_000_000:
+        return routers.primary()
+    return contextlib.nullcontext()
+
+
+def _incr(key):
+    cache = get_cache()
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, timeout=None)
+
+
+async def _aincr(key):
+    cache = get_cache()
+    try:
+        await cache.aincr(key)
+    except ValueError:
+        await cache.aset(key, 1, timeout=None)
+
+
+async def arecord(hit):
+    """Count a hit or a miss of an async view."""
+    await _aincr(HITS_KEY if hit else MISSES_KEY)
+
+
+def stats():
+    values = get_cache().get_many([HITS_KEY, MISSES_KEY])
+    hits, misses = values.get(HITS_KEY, 0), values.get(MISSES_KEY, 0)
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": hits / total if total else None,
+    }
+
+
+class CachedResponseMixin:
+    """
+    Cache the data of `list()`/`retrieve()` responses.
+
+    Entries are keyed on the absolute request URI (hyperlinks depend on the
+    host) and on the versions of the scopes the response is built from:
+    ``list:<cache_scope>`` for lists and ``<cache_scope>:<pk>`` for details.
+    See `catalog.signals` for the writes that bump them, and
+    `fill_context()` for the database misses read from.
+    """
+
+    cache_scope = None
+
+    def get_cache_scopes(self):
+        lookup = self.kwargs.get(self.lookup_url_kwarg or self.lookup_field)
+        if lookup is None:
+            return [f"list:{self.cache_scope}"]
+        return [f"{self.cache_scope}:{lookup}"]
+
+    def _cache_key(self, request, versions):
+        raw = "|".join(
+            [type(self).__name__, request.build_absolute_uri(), *map(str, versions)]
+        )
+        return f"catalog:response:{hashlib.sha1(raw.encode()).hexdigest()}"
+
+    def list(self, request, *args, **kwargs):
+        return self._cached(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._cached(super().retrieve, request, *args, **kwargs)
+
+    def _cached(self, handler, request, *args, **kwargs):
+        cache = get_cache()
+        versions = get_versions(*self.get_cache_scopes())
+        key = self._cache_key(request, versions)
+        data = cache.get(key)
+        if data is not None:
+            _incr(HITS_KEY)
+            response = Response(data)
+            response["X-Cache"] = "HIT"
+            return response
+
+        _incr(MISSES_KEY)
+        with fill_context(versions):
+            response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(key, _plain(response.data), settings.CATALOG_CACHE_TIMEOUT)
+        response["X-Cache"] = "MISS"
+        return response
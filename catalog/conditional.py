@@ -0,0 +1,66 @@
+import hashlib
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from catalog import cache
+
+
+class ConditionalGetMixin:
+    """
+    Answer `If-None-Match` / `If-Modified-Since` with a 304 before any
+    serialization happens.
+
+    Validators come from the cache versions of `get_freshness_scopes()`,
+    which `catalog.signals` and `catalog.bulk` bump on every write, deletions
+    included: the ETag hashes them, and `Last-Modified` is the newest of
+    them. No query runs, so a 304 or a cached response costs no database
+    work. Versions live in the catalog cache, so with a per-process cache
+    (no `CATALOG_CACHE_URL`) the validators are only as fresh as the cached
+    responses of that process.
+    """
+
+    def get_freshness_scopes(self):
+        """The cache scopes the response is built from, see `CachedResponseMixin`."""
+        return self.get_cache_scopes()
+
+    def get_variant(self, request):
+        """Tells apart representations of one URL, e.g. by content coding."""
+        return ""
+
+    def get_validators(self, request):
+        return self._validators(request, cache.get_versions(*self.get_freshness_scopes()))
+
+    async def aget_validators(self, request):
+        """`get_validators()` for async views."""
+        versions = await cache.aget_versions(*self.get_freshness_scopes())
+        return self._validators(request, versions)
+
+    def _validators(self, request, versions):
+        raw = "|".join(
+            [type(self).__name__, request.build_absolute_uri()]
+            + [str(version) for version in versions]
+            + [variant for variant in [self.get_variant(request)] if variant]
+        )
+        etag = f'"{hashlib.sha1(raw.encode()).hexdigest()}"'
+        # Versions are nanosecond timestamps of the last write.
+        return etag, max(versions) // 1_000_000_000
+
+    def is_conditional(self, request):
+        # `If-None-Match: *` asks whether the resource exists, which the
+        # versions cannot tell: the request is answered in full (or 404).
+        return request.headers.get("If-None-Match", "").strip() != "*"
+
+    def get(self, request, *args, **kwargs):
+        if not self.is_conditional(request):
+            return super().get(request, *args, **kwargs)
+        etag, last_modified = self.get_validators(request)
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            response.headers.setdefault("ETag", etag)
+            response.headers.setdefault("Last-Modified", http_date(last_modified))
+        return response
@@ -0,0 +1,152 @@
+import asyncio
+import io
+import sys
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+from django.urls import path
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.models import User
+from catalog import async_views, cache, views
+from catalog.models import Book, Category, Chapter, ChapterContent
+
+HOST = 'testserver'
+
+
+def urlconf(module):
+    """The catalog read routes, served by the views of `module`."""
+    urls = types.ModuleType(f'bench_{module.__name__.rsplit(".", 1)[-1]}_urls')
+    urls.urlpatterns = [
+        path('books/<int:pk>/', module.BookDetail.as_view(), name='book-detail'),
+        path('chapters/', module.ChapterList.as_view(), name='chapter-list'),
+        path('chapters/<int:pk>/', module.ChapterDetail.as_view(), name='chapter-detail'),
+    ]
+    return urls
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the throughput of concurrent chapter reads through the WSGI "
+        "handler and the DRF views with the ASGI handler and the async views. "
+        "Runs in process, on generated chapters that are deleted afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chapters', type=int, default=1000, help="Distinct chapters read.")
+        parser.add_argument('--concurrency', type=int, default=16)
+
+    def handle(self, chapters, concurrency, **options):
+        self.concurrency = concurrency
+        user, category, ids = self.populate(chapters)
+        self.cookie = f'sweasy-jwt={AccessToken.for_user(user)}'
+        try:
+            with override_settings(ALLOWED_HOSTS=[HOST]):
+                paths = [f'/chapters/{pk}/' for pk in ids]
+                with override_settings(ROOT_URLCONF=urlconf(views)):
+                    wsgi = self.run_wsgi(paths)
+                with override_settings(ROOT_URLCONF=urlconf(async_views)):
+                    asgi = asyncio.run(self.run_asgi(paths))
+        finally:
+            category.delete()
+            user.delete()
+
+        for label, elapsed in (('WSGI, DRF views', wsgi), ('ASGI, async views', asgi)):
+            self.stdout.write(
+                f"{label}: {len(paths)} reads at concurrency {concurrency} in "
+                f"{elapsed:.2f}s, {len(paths) / elapsed:.0f} req/s"
+            )
+
+    def populate(self, chapters):
+        user = User.objects.create_user(
+            username='bench-async', email='bench-async@example.com', password=None
+        )
+        category = Category.objects.create(name='Benchmark', description='Generated.')
+        book = Book.objects.create(
+            category=category, number=1, title='Benchmark', description='Generated.'
+        )
+        created = Chapter.objects.bulk_create(
+            Chapter(book=book, number=number, title=f'Chapter {number}', description='Generated.')
+            for number in range(1, chapters + 1)
+        )
+        ChapterContent.objects.bulk_create(
+            ChapterContent(chapter=chapter, content=[{'p': 'Lorem ipsum. ' * 20}] * 20)
+            for chapter in created
+        )
+        return user, category, [chapter.pk for chapter in created]
+
+    def expect_ok(self, status, path):
+        if status != 200:
+            raise RuntimeError(f'GET {path} answered {status}')
+
+    def run_wsgi(self, paths):
+        cache.get_cache().clear()
+        handler = WSGIHandler()
+
+        def get(path):
+            statuses = []
+            environ = {
+                'REQUEST_METHOD': 'GET',
+                'PATH_INFO': path,
+                'QUERY_STRING': '',
+                'SERVER_NAME': HOST,
+                'SERVER_PORT': '80',
+                'HTTP_HOST': HOST,
+                'HTTP_COOKIE': self.cookie,
+                'wsgi.url_scheme': 'http',
+                'wsgi.input': io.BytesIO(),
+                'wsgi.errors': sys.stderr,
+            }
+            body = handler(environ, lambda status, headers: statuses.append(status))
+            b''.join(body)
+            body.close()
+            self.expect_ok(int(statuses[0].split()[0]), path)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            list(pool.map(get, paths))
+        return time.perf_counter() - started
+
+    async def run_asgi(self, paths):
+        await cache.get_cache().aclear()
+        handler = ASGIHandler()
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def get(path):
+            scope = {
+                'type': 'http',
+                'asgi': {'version': '3.0'},
+                'http_version': '1.1',
+                'method': 'GET',
+                'scheme': 'http',
+                'path': path,
+                'root_path': '',
+                'query_string': b'',
+                'headers': [(b'host', HOST.encode()), (b'cookie', self.cookie.encode())],
+                'server': (HOST, 80),
+                'client': ('127.0.0.1', 0),
+            }
+            messages = []
+            # The (empty) body, then nothing: later calls wait, as on an idle
+            # connection, until the handler stops listening.
+            incoming = asyncio.Queue()
+            incoming.put_nowait({'type': 'http.request', 'body': b'', 'more_body': False})
+
+            async def receive():
+                return await incoming.get()
+
+            async def send(message):
+                messages.append(message)
+
+            async with semaphore:
+                await handler(scope, receive, send)
+            self.expect_ok(messages[0]['status'], path)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(get(path) for path in paths))
+        return time.perf_counter() - started
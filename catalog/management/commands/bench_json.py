@@ -0,0 +1,71 @@
+import io
+import json
+import time
+
+from django.core.management.base import BaseCommand
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from sweasy import renderers
+from sweasy.renderers import FastJSONParser, FastJSONRenderer
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare DRF's JSONRenderer/JSONParser with sweasy.renderers on a "
+        "generated chapter document."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--blocks', type=int, default=5000, help="Blocks in the document.")
+        parser.add_argument('--rounds', type=int, default=5, help="Best of N runs.")
+
+    def handle(self, blocks, rounds, **options):
+        self.rounds = rounds
+        payload = {
+            'url': 'http://localhost/catalog/chapters/1/',
+            'title': 'A large chapter',
+            'content': [
+                {
+                    'type': 'paragraph',
+                    'text': f'Block {n}: subnets, masks and routes — «façade» ' * 4,
+                    'level': n % 3,
+                    'meta': {'id': n, 'tags': ['ip', 'subnet'], 'ratio': n / 7},
+                }
+                for n in range(blocks)
+            ],
+        }
+        encoded = json.dumps(payload).encode()
+        self.stdout.write(
+            f"Document: {blocks} blocks, {len(encoded) / 1e6:.1f} MB; "
+            f"fast backend: {'orjson' if renderers.orjson else 'stdlib json'}"
+        )
+
+        self.compare(
+            'render',
+            lambda: JSONRenderer().render(payload),
+            lambda: FastJSONRenderer().render(payload),
+            len(encoded),
+        )
+        self.compare(
+            'parse',
+            lambda: JSONParser().parse(io.BytesIO(encoded)),
+            lambda: FastJSONParser().parse(io.BytesIO(encoded)),
+            len(encoded),
+        )
+
+    def best(self, func):
+        best = None
+        for _ in range(self.rounds):
+            started = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best
+
+    def compare(self, label, drf, fast, size):
+        before, after = self.best(drf), self.best(fast)
+        self.stdout.write(
+            f"{label}: {before * 1e3:.1f}ms ({size / before / 1e6:.0f} MB/s) -> "
+            f"{after * 1e3:.1f}ms ({size / after / 1e6:.0f} MB/s), {before / after:.1f}x"
+        )
@@ -0,0 +1,84 @@
+import io
+import logging
+import sys
+import time
+import types
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand
+from django.http import HttpResponse
+from django.test.utils import override_settings
+from django.urls import path
+
+HOST = 'testserver'
+PATH = '/api/v1/catalog/ping/'
+
+
+def ping(request):
+    return HttpResponse(b'{}', content_type='application/json')
+
+
+urls = types.ModuleType('bench_middleware_urls')
+urls.urlpatterns = [path(PATH.lstrip('/'), ping)]
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the per-request cost of the middleware in front of a catalog "
+        "endpoint: no middleware, the full MIDDLEWARE list, and MIDDLEWARE "
+        "with its MIDDLEWARE_PROFILES. The view does nothing, so the "
+        "difference to the first is the middleware overhead."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=20000)
+        parser.add_argument('--rounds', type=int, default=5, help="Best of N runs.")
+
+    def handle(self, requests, rounds, **options):
+        full = [
+            middleware
+            for middleware in settings.MIDDLEWARE
+            if middleware != 'sweasy.middleware.ProfileMiddleware'
+        ]
+        configurations = [
+            ('No middleware', []),
+            ('Full MIDDLEWARE', full),
+            ('Catalog profile', settings.MIDDLEWARE),
+        ]
+
+        results = []
+        # Requests are still logged, to nowhere.
+        logging.disable(logging.CRITICAL)
+        with override_settings(ALLOWED_HOSTS=[HOST], ROOT_URLCONF=urls):
+            for label, middleware in configurations:
+                with override_settings(MIDDLEWARE=middleware):
+                    handler = WSGIHandler()
+                    best = min(self.run(handler, requests) for _ in range(rounds))
+                results.append((label, best / requests))
+        logging.disable(logging.NOTSET)
+
+        baseline = results[0][1]
+        for label, per_request in results:
+            self.stdout.write(
+                f"{label}: {per_request * 1e6:.1f}µs per request, "
+                f"{(per_request - baseline) * 1e6:.1f}µs in middleware"
+            )
+
+    def run(self, handler, requests):
+        environ = {
+            'REQUEST_METHOD': 'GET',
+            'PATH_INFO': PATH,
+            'QUERY_STRING': '',
+            'SERVER_NAME': HOST,
+            'SERVER_PORT': '80',
+            'HTTP_HOST': HOST,
+            'HTTP_ACCEPT_ENCODING': 'gzip',
+            'wsgi.url_scheme': 'http',
+            'wsgi.errors': sys.stderr,
+        }
+        started = time.perf_counter()
+        for _ in range(requests):
+            body = handler(dict(environ, **{'wsgi.input': io.BytesIO()}), lambda *args: None)
+            body.close()
+        return time.perf_counter() - started
@@ -0,0 +1,110 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test.utils import override_settings
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from catalog.fast import (
+    BookValuesSerializer,
+    CategoryValuesSerializer,
+    ChapterValuesSerializer,
+)
+from catalog.models import Book, Category, Chapter
+from catalog.serializers import BookSerializer, CategorySerializer, ChapterReadSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the per-object cost of the DRF catalog serializers with the "
+        "`.values()` serializers of catalog.fast, on a generated category. "
+        "Nothing is left in the database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--books', type=int, default=500)
+        parser.add_argument('--chapters', type=int, default=10, help="Chapters per book.")
+        parser.add_argument('--rounds', type=int, default=5, help="Best of N runs.")
+
+    def handle(self, books, chapters, rounds, **options):
+        self.rounds = rounds
+        self.request = Request(APIRequestFactory().get('/'))
+        # The generated request comes from "testserver".
+        with override_settings(ALLOWED_HOSTS=['testserver']), transaction.atomic():
+            category = self.populate(books, chapters)
+            self.compare(
+                CategorySerializer,
+                Category.objects.filter(pk=category.pk).with_book_previews(),
+                CategoryValuesSerializer,
+                Category.objects.filter(pk=category.pk).values('id', 'name', 'description'),
+                objects=1 + books,
+            )
+            self.compare(
+                BookSerializer,
+                Book.objects.filter(category=category).with_chapter_previews(),
+                BookValuesSerializer,
+                Book.objects.filter(category=category).values(
+                    'id', 'number', 'title', 'description', 'category'
+                ),
+                objects=books * (1 + chapters),
+            )
+            self.compare(
+                ChapterReadSerializer,
+                Chapter.objects.filter(book__category=category),
+                ChapterValuesSerializer,
+                Chapter.objects.filter(book__category=category).values(
+                    'id', 'book', 'number', 'title', 'description'
+                ),
+                objects=books * chapters,
+            )
+            transaction.set_rollback(True)
+
+    def populate(self, books, chapters):
+        category = Category.objects.create(
+            name='Benchmark', description='Generated.', books_count=books
+        )
+        created = Book.objects.bulk_create(
+            Book(
+                category=category,
+                number=number,
+                title=f'Book {number}',
+                description='Generated.',
+                chapters_count=chapters,
+            )
+            for number in range(1, books + 1)
+        )
+        Chapter.objects.bulk_create(
+            Chapter(
+                book=book,
+                number=number,
+                title=f'Chapter {number}',
+                description='Generated.',
+            )
+            for book in created
+            for number in range(1, chapters + 1)
+        )
+        return category
+
+    def render(self, serializer_class, queryset):
+        best, output = None, None
+        for _ in range(self.rounds):
+            started = time.perf_counter()
+            data = serializer_class(
+                queryset.all(), many=True, context={'request': self.request}
+            ).data
+            output = JSONRenderer().render(data)
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best, output
+
+    def compare(self, serializer_class, queryset, fast_class, rows, objects):
+        before, expected = self.render(serializer_class, queryset)
+        after, actual = self.render(fast_class, rows)
+        self.stdout.write(
+            f"{serializer_class.__name__}: {objects} objects, "
+            f"{before / objects * 1e6:.1f}us -> {after / objects * 1e6:.1f}us per object "
+            f"({before / after:.1f}x), output "
+            f"{'identical' if actual == expected else 'DIFFERENT'}"
+        )
@@ -0,0 +1,55 @@
+import json
+
+from django.core.management.base import BaseCommand
+from django.db.models import TextField
+from django.db.models.functions import Cast
+
+from catalog.models import Book, Category, Chapter
+
+
+class Command(BaseCommand):
+    help = (
+        "Export the catalog as JSONL, one category, book or chapter per line, "
+        "in the format read by catalog_import."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '-o', '--output', default='-', help="File to write, or '-' for stdout."
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=1000,
+            help="Rows fetched from the database at a time.",
+        )
+
+    def handle(self, output, chunk_size, **options):
+        if output == '-':
+            self.export(self.stdout, chunk_size)
+        else:
+            with open(output, 'w', encoding='utf-8') as out:
+                self.export(out, chunk_size)
+
+    def export(self, out, chunk_size):
+        categories = Category.objects.order_by('id').values('id', 'name', 'description')
+        for row in categories.iterator(chunk_size=chunk_size):
+            out.write(json.dumps({'type': 'category', **row}) + '\n')
+
+        books = Book.objects.order_by('id').values(
+            'id', 'category', 'number', 'title', 'description'
+        )
+        for row in books.iterator(chunk_size=chunk_size):
+            out.write(json.dumps({'type': 'book', **row}) + '\n')
+
+        # Chapter documents are spliced in as stored, without a parse and
+        # re-dump round trip. Chapters without a body get an empty one, which
+        # catalog_import can load.
+        chapters = (
+            Chapter.objects.order_by('id')
+            .annotate(raw=Cast('body__content', output_field=TextField()))
+            .values('book', 'number', 'title', 'description', 'raw')
+        )
+        for row in chapters.iterator(chunk_size=chunk_size):
+            raw = row.pop('raw') or '[]'
+            out.write(json.dumps({'type': 'chapter', **row})[:-1] + f', "content": {raw}}}\n')
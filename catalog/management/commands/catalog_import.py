@@ -0,0 +1,122 @@
+import json
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import DatabaseError, connections, router, transaction
+
+from catalog import bulk
+from catalog.models import Book, Category
+
+CATEGORY_FIELDS = ('id', 'name', 'description')
+BOOK_FIELDS = ('id', 'number', 'title', 'description')
+CHAPTER_FIELDS = ('number', 'title', 'description', 'content')
+
+# What a row is upserted on: a later line for the same key replaces it.
+KEYS = {
+    'category': lambda row: row['id'],
+    'book': lambda row: row['id'],
+    'chapter': lambda row: (row['book_id'], row['number']),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Import a catalog from JSONL, one category, book or chapter per line "
+        "(see catalog_export). Categories and books are upserted by id, "
+        "chapters by (book, number)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="JSONL file to read, or '-' for stdin.")
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help="Rows written per bulk statement and transaction.",
+        )
+
+    def handle(self, path, batch_size, **options):
+        self.batch_size = batch_size
+        self.pending = {'category': {}, 'book': {}, 'chapter': {}}
+        self.lines = None
+        self.written = {'category': 0, 'book': 0, 'chapter': 0}
+
+        started = time.perf_counter()
+        if path == '-':
+            self.read(sys.stdin)
+        else:
+            with open(path, encoding='utf-8') as lines:
+                self.read(lines)
+        self.flush()
+        self.reset_sequences()
+        elapsed = time.perf_counter() - started
+
+        total = sum(self.written.values())
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {total} rows "
+                f"({self.written['category']} categories, "
+                f"{self.written['book']} books, "
+                f"{self.written['chapter']} chapters) "
+                f"in {elapsed:.2f}s, {total / elapsed if elapsed else 0:.0f} rows/sec."
+            )
+        )
+
+    def read(self, lines):
+        for lineno, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                item = json.loads(line)
+                kind = item.pop('type')
+                row = self.to_row(kind, item)
+                self.pending[kind][KEYS[kind](row)] = row
+            except (ValueError, KeyError, TypeError) as exc:
+                raise CommandError(f"Line {lineno}: invalid catalog row ({exc!r}).")
+            first = self.lines[0] if self.lines else lineno
+            self.lines = (first, lineno)
+            if len(self.pending[kind]) >= self.batch_size:
+                self.flush()
+
+    def to_row(self, kind, item):
+        if kind == 'category':
+            return {field: item[field] for field in CATEGORY_FIELDS}
+        if kind == 'book':
+            row = {field: item[field] for field in BOOK_FIELDS}
+            row['category_id'] = item['category']
+            return row
+        row = {field: item[field] for field in CHAPTER_FIELDS}
+        row['book_id'] = item['book']
+        return row
+
+    def flush(self):
+        if not self.lines:
+            return
+        # Chapters may point at books still pending, so write parents first.
+        try:
+            with transaction.atomic():
+                bulk.upsert_categories(list(self.pending['category'].values()))
+                bulk.upsert_books(list(self.pending['book'].values()))
+                bulk.upsert_chapters(list(self.pending['chapter'].values()))
+        except DatabaseError as exc:
+            first, last = self.lines
+            raise CommandError(
+                f"Lines {first}-{last}: batch not imported ({exc!r}). "
+                f"Earlier lines were imported."
+            )
+        for kind, rows in self.pending.items():
+            self.written[kind] += len(rows)
+            rows.clear()
+        self.lines = None
+
+    def reset_sequences(self):
+        # Categories and books keep the ids of the file: move the id sequences
+        # past them, as loaddata does, or the next created row would collide.
+        connection = connections[router.db_for_write(Category)]
+        statements = connection.ops.sequence_reset_sql(no_style(), [Category, Book])
+        if statements:
+            with connection.cursor() as cursor:
+                for sql in statements:
+                    cursor.execute(sql)
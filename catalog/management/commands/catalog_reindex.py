@@ -0,0 +1,19 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from catalog import search
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search index of books and chapters."
+
+    def handle(self, **options):
+        started = time.perf_counter()
+        with transaction.atomic():
+            total = search.rebuild()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(f"Indexed {total} documents in {elapsed:.2f}s.")
+        )
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from catalog import cache
+from catalog.models import Book, Category
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the stored Book.chapters_count and Category.books_count "
+        "where they drifted from the actual rows."
+    )
+
+    def handle(self, **options):
+        with transaction.atomic():
+            books = list(Book.objects.drifted().values_list('id', 'category_id'))
+            Book.objects.filter(pk__in=[pk for pk, _ in books]).recount_chapters()
+            category_ids = list(Category.objects.drifted().values_list('id', flat=True))
+            Category.objects.filter(pk__in=category_ids).recount_books()
+
+        # Chapter counts are rendered in the book previews of categories.
+        cache.bump(
+            *(f'book:{pk}' for pk, _ in books),
+            *(f'category:{category_id}' for _, category_id in books),
+            *(f'category:{category_id}' for category_id in category_ids),
+            'list:book',
+            'list:category',
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Repaired {len(books)} books and {len(category_ids)} categories."
+            )
+        )
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.5 on 2026-10-18 09:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(fields=['number', 'id'], name='catalog_book_number_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='chapter',
+            index=models.Index(fields=['number', 'id'], name='catalog_chapter_number_id_idx'),
+        ),
+    ]
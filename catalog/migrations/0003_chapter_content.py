@@ -0,0 +1,57 @@
+# Generated by Django 5.2.5 on 2026-10-18 09:03
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+BATCH_SIZE = 500
+
+
+def copy_content_to_table(apps, schema_editor):
+    Chapter = apps.get_model('catalog', 'Chapter')
+    ChapterContent = apps.get_model('catalog', 'ChapterContent')
+    rows = Chapter.objects.values_list('id', 'content').iterator(chunk_size=BATCH_SIZE)
+    batch = []
+    for chapter_id, content in rows:
+        batch.append(ChapterContent(chapter_id=chapter_id, content=content))
+        if len(batch) == BATCH_SIZE:
+            ChapterContent.objects.bulk_create(batch)
+            batch = []
+    ChapterContent.objects.bulk_create(batch)
+
+
+def copy_content_to_chapter(apps, schema_editor):
+    Chapter = apps.get_model('catalog', 'Chapter')
+    ChapterContent = apps.get_model('catalog', 'ChapterContent')
+    rows = ChapterContent.objects.values_list('chapter_id', 'content')
+    for chapter_id, content in rows.iterator(chunk_size=BATCH_SIZE):
+        Chapter.objects.filter(pk=chapter_id).update(content=content)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0002_book_chapter_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChapterContent',
+            fields=[
+                ('chapter', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='body', serialize=False, to='catalog.chapter')),
+                ('content', models.JSONField()),
+            ],
+        ),
+        # Nullable before removal so that reversing can re-add the column on
+        # a populated table and fill it back.
+        migrations.AlterField(
+            model_name='chapter',
+            name='content',
+            field=models.JSONField(null=True),
+        ),
+        migrations.RunPython(copy_content_to_table, copy_content_to_chapter),
+        migrations.RemoveField(
+            model_name='chapter',
+            name='content',
+        ),
+    ]
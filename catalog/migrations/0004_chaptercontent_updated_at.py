@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-18 09:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0003_chapter_content'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='chaptercontent',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
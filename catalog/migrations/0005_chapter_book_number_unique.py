@@ -0,0 +1,40 @@
+# Generated by Django 5.2.5 on 2026-10-18 09:10
+
+from django.db import migrations, models
+
+
+def renumber_duplicate_chapters(apps, schema_editor):
+    """
+    Keep the oldest chapter of each duplicated (book, number) where it is and
+    move the others past the last chapter of their book, so that the
+    constraint can be added without losing any chapter.
+    """
+    Chapter = apps.get_model('catalog', 'Chapter')
+    duplicates = list(
+        Chapter.objects.order_by()
+        .values('book', 'number')
+        .annotate(count=models.Count('pk'))
+        .filter(count__gt=1)
+        .values_list('book', 'number')
+    )
+    for book_id, number in duplicates:
+        chapters = Chapter.objects.filter(book_id=book_id)
+        last = chapters.aggregate(last=models.Max('number'))['last']
+        extra = chapters.filter(number=number).order_by('id').values_list('pk', flat=True)[1:]
+        for offset, pk in enumerate(list(extra), start=1):
+            Chapter.objects.filter(pk=pk).update(number=last + offset)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0004_chaptercontent_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(renumber_duplicate_chapters, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='chapter',
+            constraint=models.UniqueConstraint(fields=('book', 'number'), name='catalog_chapter_book_number_uniq'),
+        ),
+    ]
@@ -0,0 +1,49 @@
+from django.db import migrations
+
+# Full-text index used by `catalog.search.SQLiteFTSBackend`. Other databases
+# use `catalog.search.DatabaseBackend` instead, so this is a no-op for them.
+TABLES = {
+    'catalog_book_fts': ('title', 'description'),
+    'catalog_chapter_fts': ('title', 'description', 'content'),
+}
+
+
+def create_fts_tables(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for table, columns in TABLES.items():
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {table} USING fts5("
+            f"{', '.join(columns)}, tokenize='unicode61 remove_diacritics 2')"
+        )
+    # Index the existing rows; `catalog_reindex` does the same from Python.
+    schema_editor.execute(
+        "INSERT INTO catalog_book_fts (rowid, title, description) "
+        "SELECT id, title, description FROM catalog_book"
+    )
+    schema_editor.execute(
+        "INSERT INTO catalog_chapter_fts (rowid, title, description, content) "
+        "SELECT c.id, c.title, c.description, ("
+        "  SELECT group_concat(j.value, ' ') "
+        "  FROM catalog_chaptercontent cc, json_tree(cc.content) j "
+        "  WHERE cc.chapter_id = c.id AND j.type = 'text'"
+        ") FROM catalog_chapter c"
+    )
+
+
+def drop_fts_tables(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for table in TABLES:
+        schema_editor.execute(f"DROP TABLE IF EXISTS {table}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0005_chapter_book_number_unique'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts_tables, drop_fts_tables),
+    ]
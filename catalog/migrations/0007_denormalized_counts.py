@@ -0,0 +1,46 @@
+# Generated by Django 5.2.5 on 2026-10-18 09:16
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def count_existing_rows(apps, schema_editor):
+    Category = apps.get_model('catalog', 'Category')
+    Book = apps.get_model('catalog', 'Book')
+    Chapter = apps.get_model('catalog', 'Chapter')
+
+    def count_of(model, field):
+        return Coalesce(
+            models.Subquery(
+                model.objects.filter(**{field: models.OuterRef('pk')})
+                .order_by()
+                .values(field)
+                .annotate(count=models.Count('pk'))
+                .values('count')
+            ),
+            0,
+        )
+
+    Book.objects.update(chapters_count=count_of(Chapter, 'book'))
+    Category.objects.update(books_count=count_of(Book, 'category'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0006_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='book',
+            name='chapters_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='books_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_existing_rows, migrations.RunPython.noop),
+    ]
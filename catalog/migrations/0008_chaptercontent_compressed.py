@@ -0,0 +1,53 @@
+# Generated by Django 5.2.5 on 2026-10-18 09:26
+
+import gzip
+
+from django.db import migrations, models
+from django.db.models.functions import Cast
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def compress_existing_content(apps, schema_editor):
+    ChapterContent = apps.get_model('catalog', 'ChapterContent')
+    rows = ChapterContent.objects.annotate(
+        raw=Cast('content', output_field=models.TextField())
+    ).values_list('pk', 'raw')
+    batch = []
+    for pk, raw in rows.iterator(chunk_size=100):
+        data = raw.encode()
+        batch.append(
+            ChapterContent(
+                pk=pk,
+                content_gzip=gzip.compress(data, compresslevel=6, mtime=0),
+                content_br=brotli.compress(data, quality=5) if brotli else None,
+            )
+        )
+        if len(batch) == 100:
+            ChapterContent.objects.bulk_update(batch, ['content_gzip', 'content_br'])
+            batch = []
+    ChapterContent.objects.bulk_update(batch, ['content_gzip', 'content_br'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0007_denormalized_counts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='chaptercontent',
+            name='content_br',
+            field=models.BinaryField(null=True),
+        ),
+        migrations.AddField(
+            model_name='chaptercontent',
+            name='content_gzip',
+            field=models.BinaryField(null=True),
+        ),
+        migrations.RunPython(compress_existing_content, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.5 on 2026-10-18 10:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0008_chaptercontent_compressed'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=16)),
+                ('document_id', models.BigIntegerField()),
+                ('fields', models.JSONField()),
+                ('length', models.FloatField()),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('kind', 'document_id'), name='catalog_searchdocument_uniq')],
+            },
+        ),
+        migrations.CreateModel(
+            name='SearchPosting',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=16)),
+                ('document_id', models.BigIntegerField()),
+                ('term', models.CharField(max_length=64)),
+                ('frequency', models.FloatField()),
+            ],
+            options={
+                'indexes': [models.Index(fields=['kind', 'term', 'document_id'], name='catalog_searchposting_term'), models.Index(fields=['kind', 'document_id'], name='catalog_searchposting_doc')],
+            },
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.5 on 2026-10-18 11:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def clear_postings(apps, schema_editor):
+    # Postings are rebuilt from the catalog by `manage.py catalog_reindex`.
+    apps.get_model('catalog', 'SearchPosting').objects.all().delete()
+    apps.get_model('catalog', 'SearchDocument').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0009_search_documents'),
+    ]
+
+    operations = [
+        migrations.RunPython(clear_postings, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='searchposting',
+            name='catalog_searchposting_term',
+        ),
+        migrations.RemoveIndex(
+            model_name='searchposting',
+            name='catalog_searchposting_doc',
+        ),
+        migrations.RemoveField(
+            model_name='searchposting',
+            name='document_id',
+        ),
+        migrations.AddField(
+            model_name='searchposting',
+            name='document',
+            field=models.ForeignKey(default=0, on_delete=django.db.models.deletion.CASCADE, related_name='postings', to='catalog.searchdocument'),
+            preserve_default=False,
+        ),
+        migrations.AddIndex(
+            model_name='searchposting',
+            index=models.Index(fields=['kind', 'term', 'document'], name='catalog_searchposting_term'),
+        ),
+    ]
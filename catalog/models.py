@@ -1,10 +1,73 @@
 from django.db import models
+from django.db.models.functions import Coalesce
+
+
+def _count_of(model, field):
+    # COUNT(*) of `model` rows whose `field` points at the outer row.
+    return Coalesce(
+        models.Subquery(
+            model.objects.filter(**{field: models.OuterRef('pk')})
+            .order_by()
+            .values(field)
+            .annotate(count=models.Count('pk'))
+            .values('count')
+        ),
+        0,
+    )
+
+
+class CategoryQuerySet(models.QuerySet):
+    def with_book_previews(self):
+        return self.prefetch_related(
+            models.Prefetch('books', queryset=Book.objects.previews())
+        )
+
+    def recount_books(self):
+        return self.update(books_count=_count_of(Book, 'category'))
+
+    def drifted(self):
+        return self.alias(actual=_count_of(Book, 'category')).exclude(
+            books_count=models.F('actual')
+        )
+
+
+class BookQuerySet(models.QuerySet):
+    def previews(self):
+        return self.only('id', 'category', 'title', 'chapters_count')
+
+    def recount_chapters(self):
+        return self.update(chapters_count=_count_of(Chapter, 'book'))
+
+    def drifted(self):
+        return self.alias(actual=_count_of(Chapter, 'book')).exclude(
+            chapters_count=models.F('actual')
+        )
+
+    def with_chapter_previews(self):
+        return self.prefetch_related(
+            models.Prefetch('chapters', queryset=Chapter.objects.previews())
+        )
+
+
+class ChapterQuerySet(models.QuerySet):
+    # Chapter bodies live in `ChapterContent`, so none of these touch them.
+
+    def previews(self):
+        return self.only('id', 'book', 'title')
+
+    def with_content(self):
+        return self.select_related('body').defer('body__content_gzip', 'body__content_br')
+
 
 class Category(models.Model):
     name = models.CharField(max_length=255)
     description = models.TextField()
+    # Maintained by `catalog.signals`, see also `manage.py recount`.
+    books_count = models.PositiveIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+    objects = CategoryQuerySet.as_manager()
     
     def __str__(self):
         return self.name
@@ -19,9 +82,19 @@ class Book(models.Model):
     number = models.PositiveSmallIntegerField(default=0)
     title = models.CharField(max_length=255)
     description = models.TextField()
+    # Maintained by `catalog.signals`, see also `manage.py recount`.
+    chapters_count = models.PositiveIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = BookQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Keyset pagination order, see `sweasy.pagination.KeysetPagination`.
+            models.Index(fields=['number', 'id'], name='catalog_book_number_id_idx'),
+        ]
+
     def __str__(self):
         return f'{self.number} - {self.title} | #{self.category.name}'
 
@@ -35,9 +108,84 @@ class Chapter(models.Model):
     number = models.PositiveSmallIntegerField()
     title = models.CharField(max_length=255)
     description = models.TextField()
-    content = models.JSONField()
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = ChapterQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Keyset pagination order, see `sweasy.pagination.KeysetPagination`.
+            models.Index(fields=['number', 'id'], name='catalog_chapter_number_id_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['book', 'number'], name='catalog_chapter_book_number_uniq'
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.number} - {self.title} | #{self.book.title}'
+
+
+class ChapterContent(models.Model):
+    # Kept apart from `Chapter` so that listing chapters never loads the
+    # (potentially huge) JSON document.
+    chapter = models.OneToOneField(
+        Chapter,
+        primary_key=True,
+        related_name='body',
+        on_delete=models.CASCADE
+    )
+    content = models.JSONField()
+    # The stored JSON text of `content`, compressed once when it is written
+    # (see `catalog.content.compress_contents`) and served as-is.
+    content_gzip = models.BinaryField(null=True, editable=False)
+    content_br = models.BinaryField(null=True, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f'Content of {self.chapter_id}'
+
+
+class SearchDocument(models.Model):
+    # The search index of databases without FTS5, see
+    # `catalog.search.DatabaseBackend`. Filled by `catalog.signals` and
+    # `manage.py catalog_reindex`.
+    kind = models.CharField(max_length=16)
+    document_id = models.BigIntegerField()
+    # The indexed text, by field, for snippets.
+    fields = models.JSONField()
+    # Sum of the weighted term frequencies, for BM25.
+    length = models.FloatField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['kind', 'document_id'], name='catalog_searchdocument_uniq'
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.kind} {self.document_id}'
+
+
+class SearchPosting(models.Model):
+    document = models.ForeignKey(
+        SearchDocument, related_name='postings', on_delete=models.CASCADE
+    )
+    # The document's, so that a term is looked up within a kind.
+    kind = models.CharField(max_length=16)
+    term = models.CharField(max_length=64)
+    # Weighted by field, see `catalog.search.WEIGHTS`.
+    frequency = models.FloatField()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['kind', 'term', 'document'], name='catalog_searchposting_term'
+            ),
+        ]
+
     def __str__(self):
-        return f'{self.number} - {self.title} | #{self.book.title}'
\ No newline at end of file
+        return f'{self.term} in {self.document}'
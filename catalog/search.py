@@ -0,0 +1,413 @@
+import math
+import re
+import threading
+from collections import defaultdict
+from functools import lru_cache
+from html import escape
+
+from django.db import connection, router, transaction
+from django.db.models import Avg, Case, Count, F, FloatField, Sum, Value, When
+
+from catalog.models import Book, Chapter, SearchDocument, SearchPosting
+
+# Relative weight of each indexed field when ranking.
+WEIGHTS = {
+    "book": {"title": 10.0, "description": 3.0},
+    "chapter": {"title": 10.0, "description": 3.0, "content": 1.0},
+}
+KINDS = tuple(WEIGHTS)
+SNIPPET_TOKENS = 12
+BATCH_SIZE = 1000
+# Longer terms are cut to this length by `DatabaseBackend`.
+TERM_LENGTH = 64
+# Stand-ins for the highlight tags while a snippet is escaped; stripped from
+# indexed text.
+MARK_START, MARK_END = "\x02", "\x03"
+UNMARKED = str.maketrans("", "", MARK_START + MARK_END)
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# Chapters waiting for their transaction to commit, per thread, see
+# `index_chapter_on_commit()`.
+_pending = threading.local()
+
+
+def tokenize(text):
+    return _TOKEN_RE.findall(text.lower())
+
+
+def document_text(content):
+    """The text of a chapter document: every string value, in order."""
+    if isinstance(content, str):
+        return content
+    if isinstance(content, dict):
+        content = content.values()
+    elif not isinstance(content, list):
+        return ""
+    return " ".join(filter(None, (document_text(value) for value in content)))
+
+
+def chapter_fields(title, description, content):
+    return {
+        "title": title,
+        "description": description,
+        "content": document_text(content),
+    }
+
+
+def iter_documents(kind):
+    """Yield ``(id, {field: text})`` for every book or chapter, in batches."""
+    if kind == "book":
+        rows = Book.objects.order_by("id").values_list("id", "title", "description")
+        for pk, title, description in rows.iterator(chunk_size=BATCH_SIZE):
+            yield pk, {"title": title, "description": description}
+        return
+
+    rows = Chapter.objects.order_by("id").values_list(
+        "id", "title", "description", "body__content"
+    )
+    for pk, title, description, content in rows.iterator(chunk_size=BATCH_SIZE):
+        yield pk, chapter_fields(title, description, content)
+
+
+def chapter_document(chapter_id):
+    row = (
+        Chapter.objects.filter(pk=chapter_id)
+        .values_list("title", "description", "body__content")
+        .first()
+    )
+    return chapter_fields(*row) if row else None
+
+
+class SQLiteFTSBackend:
+    """
+    Search through the FTS5 tables created by the `catalog` migrations,
+    ranked with bm25() and highlighted with snippet() (escaped, see
+    `highlight()`).
+    """
+
+    def table(self, kind):
+        return f"catalog_{kind}_fts"
+
+    def index(self, kind, documents):
+        """`documents` is an iterable of ``(id, {field: text})``."""
+        fields = list(WEIGHTS[kind])
+        rows = [
+            (pk, *(doc.get(field, "").translate(UNMARKED) for field in fields))
+            for pk, doc in documents
+        ]
+        if not rows:
+            return
+        table = self.table(kind)
+        placeholders = ", ".join(["%s"] * (len(fields) + 1))
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"DELETE FROM {table} WHERE rowid = %s", [(row[0],) for row in rows]
+            )
+            cursor.executemany(
+                f"INSERT INTO {table} (rowid, {', '.join(fields)}) "
+                f"VALUES ({placeholders})",
+                rows,
+            )
+
+    def remove(self, kind, ids):
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"DELETE FROM {self.table(kind)} WHERE rowid = %s",
+                [(pk,) for pk in ids],
+            )
+
+    def clear(self, kind):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table(kind)}")
+
+    def match_expression(self, query):
+        # Quote every term so that user input is never read as FTS syntax.
+        return " ".join(f'"{term}"' for term in tokenize(query))
+
+    def count(self, query, kind):
+        if not tokenize(query):
+            return 0
+        table = self.table(kind)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT count(*) FROM {table} WHERE {table} MATCH %s",
+                [self.match_expression(query)],
+            )
+            return cursor.fetchone()[0]
+
+    def search(self, query, kind, limit, offset=0):
+        if not tokenize(query):
+            return []
+        table = self.table(kind)
+        weights = ", ".join(str(weight) for weight in WEIGHTS[kind].values())
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT rowid, title, -bm25({table}, {weights}) AS score, "
+                f"snippet({table}, -1, %s, %s, '…', {SNIPPET_TOKENS}) "
+                f"FROM {table} WHERE {table} MATCH %s "
+                f"ORDER BY score DESC LIMIT %s OFFSET %s",
+                [MARK_START, MARK_END, self.match_expression(query), limit, offset],
+            )
+            return [
+                {
+                    "type": kind,
+                    "id": pk,
+                    "title": title,
+                    "score": score,
+                    "snippet": self.highlight(snippet),
+                }
+                for pk, title, score, snippet in cursor.fetchall()
+            ]
+
+    def highlight(self, snippet):
+        """HTML of a snippet(): the text escaped, its matches in `<mark>`."""
+        return (
+            escape(snippet or "")
+            .replace(MARK_START, "<mark>")
+            .replace(MARK_END, "</mark>")
+        )
+
+
+class DatabaseBackend:
+    """
+    Inverted index in the `SearchDocument` and `SearchPosting` tables, for
+    databases without FTS5, ranked with BM25.
+
+    Being in the database, the index is shared by every process and kept
+    current by the same calls as the FTS backend. Fill it once with
+    `manage.py catalog_reindex`. Documents are scored, sorted and sliced by
+    the database: a search reads the postings of its terms through their
+    index and returns only the requested page.
+    """
+
+    k1 = 1.2
+    b = 0.75
+
+    def terms(self, text):
+        return [term[:TERM_LENGTH] for term in tokenize(text)]
+
+    def index(self, kind, documents):
+        documents = list(documents)
+        if not documents:
+            return
+        rows, frequencies = [], []
+        for pk, fields in documents:
+            found = defaultdict(float)
+            for field, weight in WEIGHTS[kind].items():
+                for term in self.terms(fields.get(field, "")):
+                    found[term] += weight
+            rows.append(
+                SearchDocument(
+                    kind=kind,
+                    document_id=pk,
+                    fields=fields,
+                    length=sum(found.values()),
+                )
+            )
+            frequencies.append(found)
+        with transaction.atomic(using=router.db_for_write(SearchDocument)):
+            self.remove(kind, [pk for pk, _ in documents])
+            rows = SearchDocument.objects.bulk_create(rows, batch_size=BATCH_SIZE)
+            SearchPosting.objects.bulk_create(
+                [
+                    SearchPosting(document=row, kind=kind, term=term, frequency=frequency)
+                    for row, found in zip(rows, frequencies)
+                    for term, frequency in found.items()
+                ],
+                batch_size=BATCH_SIZE,
+            )
+
+    def remove(self, kind, ids):
+        # Postings go with their document.
+        SearchDocument.objects.filter(kind=kind, document_id__in=ids).delete()
+
+    def clear(self, kind):
+        SearchDocument.objects.filter(kind=kind).delete()
+
+    def _matches(self, terms, kind):
+        # Postings grouped by document, for the documents holding every term.
+        return (
+            SearchPosting.objects.filter(kind=kind, term__in=terms)
+            .values("document")
+            .annotate(found=Count("term"))
+            .filter(found=len(terms))
+        )
+
+    def count(self, query, kind):
+        terms = set(self.terms(query))
+        if not terms:
+            return 0
+        return self._matches(terms, kind).count()
+
+    def score(self, terms, kind):
+        """
+        The BM25 score of a document, as an aggregate over its postings of
+        `terms`. Needs the document frequencies of the terms and the average
+        document length, read first; None when a term matches nothing.
+        """
+        stats = SearchDocument.objects.filter(kind=kind).aggregate(
+            total=Count("pk"), average=Avg("length")
+        )
+        document_frequencies = dict(
+            SearchPosting.objects.filter(kind=kind, term__in=terms)
+            .values_list("term")
+            .annotate(Count("pk"))
+        )
+        if len(document_frequencies) < len(terms):
+            return None
+        total, average = stats["total"], stats["average"] or 1
+        idf = Case(
+            *(
+                When(
+                    term=term,
+                    then=Value(math.log(1 + (total - matching + 0.5) / (matching + 0.5))),
+                )
+                for term, matching in document_frequencies.items()
+            ),
+            output_field=FloatField(),
+        )
+        frequency = F("frequency")
+        saturation = (
+            Value(self.k1 * (1 - self.b))
+            + Value(self.k1 * self.b / average) * F("document__length")
+        )
+        return Sum(
+            idf * frequency * Value(self.k1 + 1) / (frequency + saturation),
+            output_field=FloatField(),
+        )
+
+    def search(self, query, kind, limit, offset=0):
+        terms = set(self.terms(query))
+        if not terms:
+            return []
+        score = self.score(terms, kind)
+        if score is None:
+            return []
+        page = list(
+            self._matches(terms, kind)
+            .annotate(score=score)
+            .order_by("-score", "document")
+            .values_list("document", "score")[offset : offset + limit]
+        )
+        documents = {
+            pk: (document_id, fields)
+            for pk, document_id, fields in SearchDocument.objects.filter(
+                pk__in=[pk for pk, _ in page]
+            ).values_list("pk", "document_id", "fields")
+        }
+        hits = []
+        for pk, score in page:
+            document_id, fields = documents[pk]
+            hits.append(
+                {
+                    "type": kind,
+                    "id": document_id,
+                    "title": fields["title"],
+                    "score": score,
+                    "snippet": self.snippet(fields, terms),
+                }
+            )
+        return hits
+
+    def snippet(self, fields, terms):
+        """HTML: the escaped text around the first match, terms in `<mark>`."""
+        for field in WEIGHTS["chapter"]:
+            words = fields.get(field, "").split()
+            for position, word in enumerate(words):
+                if set(self.terms(word)) & terms:
+                    start = max(position - SNIPPET_TOKENS // 2, 0)
+                    window = words[start : start + SNIPPET_TOKENS]
+                    text = " ".join(
+                        f"<mark>{escape(w)}</mark>" if set(self.terms(w)) & terms else escape(w)
+                        for w in window
+                    )
+                    prefix = "…" if start else ""
+                    suffix = "…" if start + SNIPPET_TOKENS < len(words) else ""
+                    return f"{prefix}{text}{suffix}"
+        return ""
+
+
+@lru_cache(maxsize=None)
+def get_backend():
+    if connection.vendor == "sqlite":
+        return SQLiteFTSBackend()
+    return DatabaseBackend()
+
+
+def index_books(books):
+    get_backend().index(
+        "book",
+        [(book.pk, {"title": book.title, "description": book.description}) for book in books],
+    )
+
+
+def index_chapter(chapter_id):
+    document = chapter_document(chapter_id)
+    if document is not None:
+        get_backend().index("chapter", [(chapter_id, document)])
+
+
+def index_chapter_on_commit(chapter_id):
+    """
+    `index_chapter()` once the current transaction commits, however many
+    times the chapter and its content were saved in it: only the last call
+    indexes, after everything was written.
+    """
+    latest = _pending.__dict__.setdefault("chapters", {})
+    token = latest[chapter_id] = object()
+
+    def index():
+        if latest.get(chapter_id) is token:
+            del latest[chapter_id]
+            index_chapter(chapter_id)
+
+    transaction.on_commit(index)
+
+
+def rebuild():
+    """Reindex every book and chapter. Returns the number of documents."""
+    backend = get_backend()
+    total = 0
+    for kind in KINDS:
+        backend.clear(kind)
+        batch = []
+        for document in iter_documents(kind):
+            batch.append(document)
+            if len(batch) == BATCH_SIZE:
+                backend.index(kind, batch)
+                total += len(batch)
+                batch = []
+        backend.index(kind, batch)
+        total += len(batch)
+    return total
+
+
+class SearchResults:
+    """
+    Lazy, sliceable hits of `query` across `kinds`, so that DRF paginators
+    can count and slice them like a queryset.
+    """
+
+    def __init__(self, query, kinds=KINDS):
+        self.query = query
+        self.kinds = kinds
+        self.backend = get_backend()
+
+    def count(self):
+        return sum(self.backend.count(self.query, kind) for kind in self.kinds)
+
+    def __getitem__(self, page):
+        offset = page.start or 0
+        if len(self.kinds) == 1:
+            return self.backend.search(
+                self.query, self.kinds[0], page.stop - offset, offset
+            )
+        # Each kind is ranked on its own; merge the top `stop` of each.
+        hits = [
+            hit
+            for kind in self.kinds
+            for hit in self.backend.search(self.query, kind, page.stop)
+        ]
+        hits.sort(key=lambda hit: -hit["score"])
+        return hits[offset : page.stop]
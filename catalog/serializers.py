@@ -1,13 +1,12 @@
+from django.db import transaction
 from rest_framework import serializers
-from catalog.models import Category, Book, Chapter
+from catalog.models import Category, Book, Chapter, ChapterContent
 from rest_framework.reverse import reverse
+from catalog.sparse import DynamicFieldsMixin
 
 
 class BookPreviewSerializer(serializers.HyperlinkedModelSerializer):
-    chapters_number = serializers.SerializerMethodField()
-    
-    def get_chapters_number(self, obj):
-        return obj.chapters.count()
+    chapters_number = serializers.IntegerField(source='chapters_count', read_only=True)
     
     class Meta:
         model = Book
@@ -20,7 +19,8 @@ class ChapterPreviewSerializer(serializers.HyperlinkedModelSerializer):
         model = Chapter
         fields = ['title', 'url']
 
-class CategorySerializer(serializers.HyperlinkedModelSerializer):
+class CategorySerializer(DynamicFieldsMixin, serializers.HyperlinkedModelSerializer):
+    expandable_fields = ['books']
     books = BookPreviewSerializer(many=True, read_only=True)
     
     class Meta:
@@ -28,19 +28,49 @@ class CategorySerializer(serializers.HyperlinkedModelSerializer):
         fields = ['name', 'description', 'books', 'url']
         
 
-class BookSerializer(serializers.HyperlinkedModelSerializer):
+class BookSerializer(DynamicFieldsMixin, serializers.HyperlinkedModelSerializer):
+    expandable_fields = ['chapters']
     chapters = ChapterPreviewSerializer(many=True, read_only=True)
     
     class Meta:
         model = Book
         fields = ['number', 'title', 'description', 'category', 'chapters', 'url']
 
-class ChapterReadSerializer(serializers.HyperlinkedModelSerializer):
+class ChapterReadSerializer(DynamicFieldsMixin, serializers.HyperlinkedModelSerializer):
     class Meta:
         model = Chapter
         fields = ['url', 'book', 'number', 'title', 'description']
         
-class ChapterWriteSerializer(serializers.ModelSerializer):
+class ChapterWriteSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    content = serializers.JSONField(source='body.content')
+
     class Meta:
         model = Chapter
         fields = ['book', 'number', 'title', 'description', 'content']
+
+    @transaction.atomic
+    @transaction.atomic
+    def create(self, validated_data):
+        content = validated_data.pop('body')['content']
+        chapter = super().create(validated_data)
+        ChapterContent.objects.create(chapter=chapter, content=content)
+        return chapter
+
+    @transaction.atomic
+    def update(self, instance, validated_data):
+        body = validated_data.pop('body', None)
+        chapter = super().update(instance, validated_data)
+        if body is not None:
+            ChapterContent.objects.update_or_create(
+                chapter=chapter, defaults={'content': body['content']}
+            )
+        return chapter
+
+
+class ChapterBatchItemSerializer(serializers.ModelSerializer):
+    # The book comes from the URL, so items carry no relation to look up.
+    content = serializers.JSONField()
+
+    class Meta:
+        model = Chapter
+        fields = ['number', 'title', 'description', 'content']
@@ -0,0 +1,135 @@
+from django.db import router
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from catalog import cache, content, search
+from catalog.models import Book, Category, Chapter, ChapterContent
+
+
+def _previous(sender, instance, field):
+    """Value of `field` as currently stored, or None for new rows."""
+    if instance._state.adding or instance.pk is None:
+        return None
+    return _primary(sender).filter(pk=instance.pk).values_list(field, flat=True).first()
+
+
+def _category_of(book_id):
+    return _primary(Book).filter(pk=book_id).values_list("category_id", flat=True).first()
+
+
+def _primary(model):
+    # Counters and cache keys follow the rows being written, never a replica
+    # that may lag behind.
+    return model.objects.using(router.db_for_write(model))
+
+
+@receiver(pre_save, sender=Book)
+def remember_book_category(sender, instance, **kwargs):
+    instance._previous_category_id = _previous(sender, instance, "category_id")
+
+
+@receiver(pre_save, sender=Chapter)
+def remember_chapter_book(sender, instance, **kwargs):
+    instance._previous_book_id = _previous(sender, instance, "book_id")
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category(sender, instance, **kwargs):
+    cache.bump(f"category:{instance.pk}", "list:category")
+
+
+@receiver(post_save, sender=Book)
+@receiver(post_delete, sender=Book)
+def invalidate_book(sender, instance, **kwargs):
+    category_ids = {
+        instance.category_id,
+        getattr(instance, "_previous_category_id", None),
+    } - {None}
+    cache.bump(
+        f"book:{instance.pk}",
+        *(f"category:{category_id}" for category_id in category_ids),
+        "list:book",
+        "list:category",
+    )
+
+
+@receiver(post_save, sender=Chapter)
+@receiver(post_delete, sender=Chapter)
+def invalidate_chapter(sender, instance, **kwargs):
+    # Books embed chapter previews and categories embed chapter counts.
+    book_ids = {instance.book_id, getattr(instance, "_previous_book_id", None)} - {None}
+    category_ids = {_category_of(book_id) for book_id in book_ids} - {None}
+    cache.bump(
+        f"chapter:{instance.pk}",
+        *(f"book:{book_id}" for book_id in book_ids),
+        *(f"category:{category_id}" for category_id in category_ids),
+        "list:chapter",
+        "list:book",
+        "list:category",
+    )
+
+
+@receiver(post_save, sender=ChapterContent)
+@receiver(post_delete, sender=ChapterContent)
+def invalidate_chapter_content(sender, instance, **kwargs):
+    cache.bump(f"chapter:{instance.chapter_id}")
+
+
+@receiver(post_save, sender=ChapterContent)
+def compress_chapter_content(sender, instance, **kwargs):
+    content.compress_contents([instance.pk])
+
+
+@receiver(post_save, sender=Book)
+def index_book(sender, instance, **kwargs):
+    search.index_books([instance])
+
+
+@receiver(post_save, sender=Chapter)
+@receiver(post_save, sender=ChapterContent)
+@receiver(post_delete, sender=ChapterContent)
+def index_chapter(sender, instance, **kwargs):
+    # A chapter and its content are saved one after the other: index once,
+    # when both are written.
+    search.index_chapter_on_commit(instance.pk)
+
+
+@receiver(post_delete, sender=Book)
+@receiver(post_delete, sender=Chapter)
+def unindex(sender, instance, **kwargs):
+    search.get_backend().remove(sender._meta.model_name, [instance.pk])
+
+
+def _move_count(model, field, old_id, new_id):
+    if old_id == new_id:
+        return
+    if old_id is not None:
+        model.objects.filter(pk=old_id, **{f"{field}__gt": 0}).update(
+            **{field: F(field) - 1}
+        )
+    if new_id is not None:
+        model.objects.filter(pk=new_id).update(**{field: F(field) + 1})
+
+
+@receiver(post_save, sender=Book)
+def count_book(sender, instance, created, **kwargs):
+    old_id = None if created else getattr(instance, "_previous_category_id", None)
+    _move_count(Category, "books_count", old_id, instance.category_id)
+
+
+@receiver(post_delete, sender=Book)
+def uncount_book(sender, instance, **kwargs):
+    _move_count(Category, "books_count", instance.category_id, None)
+
+
+@receiver(post_save, sender=Chapter)
+def count_chapter(sender, instance, created, **kwargs):
+    old_id = None if created else getattr(instance, "_previous_book_id", None)
+    _move_count(Book, "chapters_count", old_id, instance.book_id)
+
+
+@receiver(post_delete, sender=Chapter)
+def uncount_chapter(sender, instance, **kwargs):
+    _move_count(Book, "chapters_count", instance.book_id, None)
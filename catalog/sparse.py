@@ -0,0 +1,94 @@
+def _query_list(request, name):
+    raw = request.query_params.get(name)
+    if raw is None:
+        return None
+    return {item.strip() for item in raw.split(",") if item.strip()}
+
+
+class DynamicFieldsMixin:
+    """
+    Serializer mixin honouring `?fields=` and `?expand=`.
+
+    `?fields=a,b` renders only the listed fields. Nested relations named in
+    `expandable_fields` are embedded by default; once `?expand=` is given,
+    only the relations it lists are embedded and the others are left out.
+    Unknown names are ignored.
+    """
+
+    expandable_fields = ()
+
+    @classmethod
+    def requested_fields(cls, request):
+        """Return ``(fields to render, nested relations to embed)``."""
+        fields = list(cls.Meta.fields)
+        if request is None:
+            return fields, [name for name in fields if name in cls.expandable_fields]
+
+        selected = _query_list(request, "fields")
+        if selected is not None:
+            fields = [name for name in fields if name in selected]
+        expand = _query_list(request, "expand")
+        expanded = [
+            name
+            for name in fields
+            if name in cls.expandable_fields and (expand is None or name in expand)
+        ]
+        fields = [
+            name for name in fields if name not in cls.expandable_fields or name in expanded
+        ]
+        return fields, expanded
+
+    def get_fields(self):
+        fields = super().get_fields()
+        rendered, _ = self.requested_fields(self.context.get("request"))
+        return {name: field for name, field in fields.items() if name in rendered}
+
+
+class SparseQuerysetMixin:
+    """
+    View mixin loading only what the serializer will render.
+
+    Only the model columns behind the requested fields are selected (plus
+    the primary key and pagination ordering), and `expansions` maps a
+    rendered field to the queryset method that joins or prefetches it.
+    Serializers reading `.values()` rows (see `catalog.fast`) load nested
+    relations themselves and get no expansions.
+    """
+
+    expansions = {}
+
+    def get_columns(self, queryset, fields, sources=None):
+        opts = queryset.model._meta
+        concrete = {field.name for field in opts.concrete_fields}
+        sources = sources or {}
+        columns = {opts.pk.name, *getattr(self, "ordering", ())}
+        columns.update(name for name in fields if name in concrete)
+        columns.update(sources[name] for name in fields if name in sources)
+        return columns
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        serializer_class = self.get_serializer_class()
+        if not hasattr(serializer_class, "requested_fields"):
+            return queryset
+
+        fields, _ = serializer_class.requested_fields(self.request)
+        if getattr(serializer_class, "from_values", False):
+            # Serializers reading `.values()` rows load nested relations
+            # themselves.
+            return queryset.values(
+                *self.get_columns(queryset, fields, serializer_class.sources)
+            )
+
+        for name in fields:
+            if name in self.expansions:
+                queryset = getattr(queryset, self.expansions[name])()
+        columns = self.get_columns(queryset, fields)
+        # Joined relations cannot be deferred: keep the columns the expansion
+        # loads of them, which `only()` would otherwise reset.
+        deferred, is_defer = queryset.query.deferred_loading
+        for relation in queryset.query.select_related or ():
+            related = queryset.model._meta.get_field(relation).related_model
+            names = [f"{relation}__{field.name}" for field in related._meta.concrete_fields]
+            columns.update(name for name in names if not (is_defer and name in deferred))
+        return queryset.only(*columns)
@@ -1,20 +1,36 @@
+from django.conf import settings
 from django.urls import path
+from catalog import async_views, views
 from catalog.views import (
     api_root,
-    BookDetail,
-    BookList,
-    CategoryDetail,
-    CategoryList,
-    ChapterDetail,
-    ChapterList,
+    cache_stats,
+    CatalogSearch,
+    ChapterBatch,
+    ChapterContentDetail,
 )
 
+# Under ASGI (see sweasy/asgi.py) the read endpoints are served by their
+# async twins.
+read_views = async_views if settings.CATALOG_ASYNC_VIEWS else views
+
 urlpatterns = [
     path("", api_root, name="api-root"),
-    path("categories/", CategoryList.as_view(), name="category-list"),
-    path("categories/<int:pk>/", CategoryDetail.as_view(), name="category-detail"),
-    path("books/", BookList.as_view(), name="book-list"),
-    path("books/<int:pk>/", BookDetail.as_view(), name="book-detail"),
-    path("chapters/", ChapterList.as_view(), name="chapter-list"),
-    path("chapters/<int:pk>/", ChapterDetail.as_view(), name="chapter-detail"),
+    path("categories/", read_views.CategoryList.as_view(), name="category-list"),
+    path("categories/<int:pk>/", read_views.CategoryDetail.as_view(), name="category-detail"),
+    path("books/", read_views.BookList.as_view(), name="book-list"),
+    path("books/<int:pk>/", read_views.BookDetail.as_view(), name="book-detail"),
+    path(
+        "books/<int:pk>/chapters/batch/",
+        ChapterBatch.as_view(),
+        name="chapter-batch",
+    ),
+    path("chapters/", read_views.ChapterList.as_view(), name="chapter-list"),
+    path("chapters/<int:pk>/", read_views.ChapterDetail.as_view(), name="chapter-detail"),
+    path(
+        "chapters/<int:pk>/content/",
+        ChapterContentDetail.as_view(),
+        name="chapter-content",
+    ),
+    path("search/", CatalogSearch.as_view(), name="catalog-search"),
+    path("cache/stats/", cache_stats, name="catalog-cache-stats"),
 ]
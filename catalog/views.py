@@ -1,14 +1,29 @@
-from rest_framework import generics, permissions
-from rest_framework.decorators import api_view
+from django.db import transaction
+from django.http import HttpResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils.cache import patch_vary_headers
+from rest_framework import generics, permissions, status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.exceptions import NotFound, ParseError
+from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.response import Response
 from rest_framework.reverse import reverse
-from catalog.models import Chapter, Book, Category
+from catalog import bulk, cache, content, search
+from catalog.cache import CachedResponseMixin
+from catalog.conditional import ConditionalGetMixin
+from catalog.fast import (
+    BookValuesSerializer,
+    CategoryValuesSerializer,
+    ChapterValuesSerializer,
+)
+from catalog.models import Chapter, ChapterContent, Book, Category
+from catalog.sparse import SparseQuerysetMixin
 from catalog.serializers import (
-    ChapterReadSerializer,
+    ChapterBatchItemSerializer,
     ChapterWriteSerializer,
-    BookSerializer,
-    CategorySerializer
 )
+from sweasy.authentication import StatelessJWTCookieAuthentication
+from sweasy.pagination import KeysetPagination
 
 
 @api_view(['GET'])
@@ -18,37 +33,263 @@ def api_root(request, format=None):
         'books': reverse('book-list', request=request, format=format),
         'chapters': reverse('chapter-list', request=request, format=format),
     })
-    
-class CategoryList(generics.ListAPIView):
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAdminUser])
+def cache_stats(request, format=None):
+    return Response(cache.stats())
+
+class CategoryList(
+    ConditionalGetMixin, CachedResponseMixin, SparseQuerysetMixin, generics.ListAPIView
+):
     queryset = Category.objects.all()
-    serializer_class = CategorySerializer
+    serializer_class = CategoryValuesSerializer
+    authentication_classes = [StatelessJWTCookieAuthentication]
     permission_classes = [permissions.IsAuthenticated]
+    cache_scope = "category"
+    pagination_class = KeysetPagination
+    ordering = ("id",)
 
-class CategoryDetail(generics.RetrieveAPIView):
+class CategoryDetail(
+    ConditionalGetMixin, CachedResponseMixin, SparseQuerysetMixin, generics.RetrieveAPIView
+):
     queryset = Category.objects.all()
-    serializer_class = CategorySerializer
+    serializer_class = CategoryValuesSerializer
+    authentication_classes = [StatelessJWTCookieAuthentication]
     permission_classes = [permissions.IsAuthenticated]
+    cache_scope = "category"
 
-class BookList(generics.ListAPIView):
+class BookList(
+    ConditionalGetMixin, CachedResponseMixin, SparseQuerysetMixin, generics.ListAPIView
+):
     queryset = Book.objects.all()
-    serializer_class = BookSerializer
+    serializer_class = BookValuesSerializer
+    authentication_classes = [StatelessJWTCookieAuthentication]
     permission_classes = [permissions.IsAuthenticated]
+    cache_scope = "book"
+    pagination_class = KeysetPagination
+    ordering = ("number", "id")
 
-class BookDetail(generics.RetrieveAPIView):
+class BookDetail(
+    ConditionalGetMixin, CachedResponseMixin, SparseQuerysetMixin, generics.RetrieveAPIView
+):
     queryset = Book.objects.all()
-    serializer_class = BookSerializer
+    serializer_class = BookValuesSerializer
+    authentication_classes = [StatelessJWTCookieAuthentication]
     permission_classes = [permissions.IsAuthenticated]
+    cache_scope = "book"
 
-class ChapterList(generics.ListAPIView):
+class ChapterList(
+    ConditionalGetMixin, CachedResponseMixin, SparseQuerysetMixin, generics.ListAPIView
+):
     queryset = Chapter.objects.all()
+    authentication_classes = [StatelessJWTCookieAuthentication]
     permission_classes = [permissions.IsAuthenticated]
+    cache_scope = "chapter"
+    pagination_class = KeysetPagination
+    ordering = ("number", "id")
 
     def get_serializer_class(self):
         if self.request.method == 'POST':
             return ChapterWriteSerializer
-        return ChapterReadSerializer
+        return ChapterValuesSerializer
 
-class ChapterDetail(generics.RetrieveAPIView):
+class ChapterDetail(
+    ConditionalGetMixin, CachedResponseMixin, SparseQuerysetMixin, generics.RetrieveAPIView
+):
     queryset = Chapter.objects.all()
+    expansions = {"content": "with_content"}
     serializer_class = ChapterWriteSerializer
+    authentication_classes = [StatelessJWTCookieAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+    cache_scope = "chapter"
+
+
+class ChapterContentDetail(ConditionalGetMixin, generics.RetrieveAPIView):
+    """
+    The stored chapter document, streamed as-is.
+
+    Supports single `Range: bytes=...` requests and `?blocks=N-M` to fetch
+    only some top-level blocks of the document. Whole documents are served
+    from their precompressed variants when `Accept-Encoding` allows.
+    """
+
+    queryset = ChapterContent.objects.all()
+    authentication_classes = [StatelessJWTCookieAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_freshness_scopes(self):
+        return [f"chapter:{self.kwargs['pk']}"]
+
+    def get_encodings(self, request):
+        # Ranges and blocks address the identity document.
+        if "blocks" in request.query_params or "Range" in request.headers:
+            return []
+        return content.accepted_encodings(request.headers.get("Accept-Encoding"))
+
+    def get_variant(self, request):
+        return ",".join(self.get_encodings(request))
+
+    def get(self, request, *args, **kwargs):
+        response = super().get(request, *args, **kwargs)
+        patch_vary_headers(response, ("Accept-Encoding",))
+        return response
+
+    def retrieve(self, request, *args, **kwargs):
+        for coding in self.get_encodings(request):
+            data = content.precompressed_content(self.kwargs["pk"], coding)
+            if data is not None:
+                response = HttpResponse(data, content_type="application/json")
+                response["Content-Encoding"] = coding
+                return response
+
+        raw = content.raw_content(self.kwargs["pk"])
+        if raw is None:
+            raise NotFound()
+
+        if "blocks" in request.query_params:
+            blocks = content.parse_blocks(request.query_params["blocks"])
+            if blocks is None:
+                raise ParseError("Expected ?blocks=N-M or ?blocks=N-.")
+            raw = content.slice_blocks(raw, blocks)
+
+        data = raw.encode()
+        size = len(data)
+        byte_range = None
+        etag, last_modified = self.get_validators(request)
+        # A stale `If-Range` gets the whole document instead of the range.
+        if content.if_range_matches(
+            request.headers.get("If-Range"), etag, last_modified
+        ):
+            try:
+                byte_range = content.parse_range(request.headers.get("Range"), size)
+            except content.UnsatisfiableRange:
+                response = HttpResponse(status=416)
+                response["Content-Range"] = f"bytes */{size}"
+                return response
+
+        start, end = byte_range or (0, size - 1)
+        response = StreamingHttpResponse(
+            content.iter_chunks(data, start, end),
+            content_type="application/json",
+            status=206 if byte_range else 200,
+        )
+        response["Accept-Ranges"] = "bytes"
+        response["Content-Length"] = end - start + 1
+        if byte_range:
+            response["Content-Range"] = f"bytes {start}-{end}/{size}"
+        return response
+
+
+class ChapterBatch(generics.GenericAPIView):
+    """
+    Create or update many chapters of a book in one request.
+
+    Takes a list of chapters; each one is matched to an existing chapter of
+    the book by `number`. Either every item is valid and all of them are
+    written in one transaction, or nothing is written and the errors are
+    reported per item. Cached responses are invalidated once it commits.
+    """
+
+    queryset = Book.objects.all()
+    serializer_class = ChapterBatchItemSerializer
+    # Writes authenticate against the user row, never the token's claims alone.
+    permission_classes = [permissions.IsAdminUser]
+    max_batch_size = 1000
+
+    def post(self, request, pk, format=None):
+        book = get_object_or_404(Book.objects.only('id'), pk=pk)
+        items = request.data
+        if not isinstance(items, list) or not items:
+            return Response(
+                {"detail": "Expected a non-empty list of chapters."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(items) > self.max_batch_size:
+            return Response(
+                {"detail": f"At most {self.max_batch_size} chapters per request."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        rows, errors, seen = [], [], set()
+        for item in items:
+            serializer = self.get_serializer(data=item)
+            if not serializer.is_valid():
+                errors.append(serializer.errors)
+                continue
+            number = serializer.validated_data["number"]
+            if number in seen:
+                errors.append({"number": ["Duplicate chapter number in this batch."]})
+                continue
+            seen.add(number)
+            rows.append(dict(serializer.validated_data, book_id=book.pk))
+            errors.append(None)
+
+        if any(errors):
+            return Response(
+                [
+                    {
+                        "index": index,
+                        "status": "invalid" if error else "valid",
+                        "errors": error,
+                    }
+                    for index, error in enumerate(errors)
+                ],
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        with transaction.atomic():
+            existing = set(
+                book.chapters.filter(number__in=seen).values_list("number", flat=True)
+            )
+            chapters = bulk.upsert_chapters(rows)
+
+        return Response(
+            [
+                {
+                    "index": index,
+                    "status": "updated" if chapter.number in existing else "created",
+                    "id": chapter.pk,
+                    "number": chapter.number,
+                    "url": reverse(
+                        "chapter-detail", args=[chapter.pk], request=request
+                    ),
+                }
+                for index, chapter in enumerate(chapters)
+            ],
+            status=status.HTTP_200_OK,
+        )
+
+
+class SearchPagination(LimitOffsetPagination):
+    default_limit = 20
+    max_limit = 100
+
+
+class CatalogSearch(generics.GenericAPIView):
+    """
+    Ranked full-text search over books and chapters.
+
+    `?q=` is required; `?type=book` or `?type=chapter` restricts the kinds
+    searched. `snippet` is HTML: escaped text, matches in `<mark>`.
+    """
+
+    authentication_classes = [StatelessJWTCookieAuthentication]
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = SearchPagination
+
+    def get(self, request, format=None):
+        query = request.query_params.get("q", "")
+        if not search.tokenize(query):
+            raise ParseError("Expected a search query in ?q=.")
+        kind = request.query_params.get("type")
+        if kind and kind not in search.KINDS:
+            raise ParseError(f"?type= must be one of {', '.join(search.KINDS)}.")
+
+        hits = self.paginate_queryset(
+            search.SearchResults(query, (kind,) if kind else search.KINDS)
+        )
+        for hit in hits:
+            hit["url"] = reverse(f"{hit['type']}-detail", args=[hit["id"]], request=request)
+        return self.get_paginated_response(hits)
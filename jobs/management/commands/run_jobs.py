@@ -0,0 +1,41 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from jobs import worker
+
+
+class Command(BaseCommand):
+    help = (
+        "Run due background jobs in batches, retrying failures with "
+        "exponential backoff, and schedule the periodic ones (JOBS_PERIODIC). "
+        "Polls until interrupted unless --once is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help="Run the due jobs, then exit.")
+        parser.add_argument('--batch-size', type=int, default=settings.JOBS_BATCH_SIZE)
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=settings.JOBS_POLL_INTERVAL,
+            help="Seconds to wait when no job is due.",
+        )
+
+    def handle(self, once, batch_size, poll_interval, **options):
+        worker.schedule_periodic()
+        total = 0
+        try:
+            while True:
+                close_old_connections()
+                ran = worker.run_pending(batch_size)
+                total += ran
+                if once and not ran:
+                    break
+                if not ran:
+                    time.sleep(poll_interval)
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(f"Ran {total} jobs.")
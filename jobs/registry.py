@@ -0,0 +1,34 @@
+from django.conf import settings
+from django.utils import timezone
+
+from jobs.models import Job
+
+TASKS = {}
+
+
+def task(func=None, *, max_attempts=None):
+    """
+    Register `func` as a task, runnable from a job. Its name is its dotted
+    path, and its payload the keyword arguments it is enqueued with.
+    """
+
+    def register(func):
+        func.task_name = f'{func.__module__}.{func.__qualname__}'
+        func.max_attempts = max_attempts or settings.JOBS_MAX_ATTEMPTS
+        TASKS[func.task_name] = func
+        return func
+
+    return register(func) if func is not None else register
+
+
+def enqueue(func, run_at=None, **payload):
+    """
+    Store a job that calls `func(**payload)`, at `run_at` or as soon as
+    possible. Inside a transaction, the job commits (or rolls back) with it.
+    """
+    return Job.objects.create(
+        name=func.task_name,
+        payload=payload,
+        max_attempts=func.max_attempts,
+        run_at=run_at or timezone.now(),
+    )
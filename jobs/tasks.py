@@ -0,0 +1,42 @@
+from django.core.mail import EmailMultiAlternatives
+
+from jobs.registry import enqueue, task
+
+
+@task(max_attempts=8)
+def send_email(
+    subject,
+    body,
+    from_email,
+    to,
+    cc=(),
+    bcc=(),
+    reply_to=(),
+    headers=None,
+    alternatives=(),
+    content_subtype='plain',
+):
+    message = EmailMultiAlternatives(
+        subject, body, from_email, to, bcc=bcc, cc=cc, reply_to=reply_to, headers=headers
+    )
+    message.content_subtype = content_subtype
+    for content, mimetype in alternatives:
+        message.attach_alternative(content, mimetype)
+    message.send()
+
+
+def queue_email(message):
+    """Send the `EmailMessage` from a job instead of the current thread."""
+    return enqueue(
+        send_email,
+        subject=message.subject,
+        body=message.body,
+        from_email=message.from_email,
+        to=message.to,
+        cc=message.cc,
+        bcc=message.bcc,
+        reply_to=message.reply_to,
+        headers=message.extra_headers,
+        alternatives=[list(alternative) for alternative in getattr(message, 'alternatives', [])],
+        content_subtype=message.content_subtype,
+    )
@@ -0,0 +1,101 @@
+import logging
+import random
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from jobs.models import Job
+from jobs.registry import TASKS
+
+logger = logging.getLogger(__name__)
+
+
+def backoff(attempts):
+    """Delay before retrying a job that failed `attempts` times, with jitter."""
+    delay = min(settings.JOBS_BACKOFF_BASE * 2 ** (attempts - 1), settings.JOBS_BACKOFF_MAX)
+    return timedelta(seconds=delay * random.uniform(1, 1.25))
+
+
+def claim(batch_size):
+    """
+    Mark up to `batch_size` due jobs as running and return them. Jobs left
+    running for `JOBS_LOCK_TIMEOUT` seconds by a worker that died are due
+    again.
+    """
+    now = timezone.now()
+    due = Q(status=Job.PENDING, run_at__lte=now) | Q(
+        status=Job.RUNNING, locked_at__lt=now - timedelta(seconds=settings.JOBS_LOCK_TIMEOUT)
+    )
+    with transaction.atomic():
+        jobs = Job.objects.filter(due).order_by('run_at')
+        if connection.features.has_select_for_update_skip_locked:
+            # Concurrent workers skip each other's batches. SQLite needs no
+            # row locks: its write transactions already run one at a time.
+            jobs = jobs.select_for_update(skip_locked=True)
+        jobs = list(jobs[:batch_size])
+        Job.objects.filter(pk__in=[job.pk for job in jobs]).update(
+            status=Job.RUNNING, locked_at=now, attempts=F('attempts') + 1
+        )
+    for job in jobs:
+        job.status, job.locked_at, job.attempts = Job.RUNNING, now, job.attempts + 1
+    return jobs
+
+
+def run_pending(batch_size=None):
+    """Run one batch of due jobs; return how many were run."""
+    jobs = claim(batch_size or settings.JOBS_BATCH_SIZE)
+    done = []
+    for job in jobs:
+        try:
+            func = TASKS[job.name]
+        except KeyError:
+            fail(job, f'Unknown task {job.name}', retry=False)
+            continue
+        try:
+            func(**job.payload)
+        except Exception:
+            fail(job, traceback.format_exc())
+        else:
+            done.append(job)
+
+    periodic = [job for job in done if job.name in settings.JOBS_PERIODIC]
+    Job.objects.filter(pk__in=[job.pk for job in done if job not in periodic]).delete()
+    for job in periodic:
+        reschedule(job)
+    return len(jobs)
+
+
+def fail(job, error, retry=True):
+    if retry and job.attempts < job.max_attempts:
+        job.status = Job.PENDING
+        job.run_at = timezone.now() + backoff(job.attempts)
+        logger.warning('Job %s failed, retrying at %s:\n%s', job, job.run_at, error)
+    else:
+        job.status = Job.FAILED
+        logger.error('Job %s failed for good:\n%s', job, error)
+    job.locked_at = None
+    job.last_error = error
+    job.save(update_fields=['status', 'run_at', 'locked_at', 'last_error'])
+
+
+def reschedule(job):
+    """Queue the next run of a periodic job, reusing its row."""
+    job.status = Job.PENDING
+    job.attempts = 0
+    job.locked_at = None
+    job.last_error = ''
+    job.run_at = timezone.now() + timedelta(seconds=settings.JOBS_PERIODIC[job.name])
+    job.save(update_fields=['status', 'attempts', 'locked_at', 'last_error', 'run_at'])
+
+
+def schedule_periodic():
+    """Make sure every task of `JOBS_PERIODIC` has a job, due now if new."""
+    for name in settings.JOBS_PERIODIC:
+        if name not in TASKS:
+            raise KeyError(f'Unknown periodic task {name}')
+        if not Job.objects.filter(name=name).exclude(status=Job.FAILED).exists():
+            Job.objects.create(name=name, max_attempts=TASKS[name].max_attempts)
@@ -12,5 +12,12 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'sweasy.settings')
+# Serve the catalog reads from the async views, see `catalog.async_views`.
+os.environ.setdefault('CATALOG_ASYNC_VIEWS', '1')
 
 application = get_asgi_application()
+
+from sweasy import hashers  # noqa: E402
+
+# Calibrate the password hasher and load the password validators at startup.
+hashers.warm_up()
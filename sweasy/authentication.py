@@ -0,0 +1,121 @@
+from dj_rest_auth.app_settings import api_settings as rest_auth_settings
+from dj_rest_auth.jwt_auth import JWTCookieAuthentication
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from sweasy import revocation
+
+TOKEN_VERSION_CLAIM = "ver"
+# User fields copied into tokens, and read back by `TokenUser`.
+USER_CLAIMS = ("username", "is_active", "is_staff", "is_superuser")
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Tokens carrying the claims that `StatelessJWTCookieAuthentication` trusts."""
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        token[TOKEN_VERSION_CLAIM] = user.token_version
+        for claim in USER_CLAIMS:
+            token[claim] = getattr(user, claim)
+        return token
+
+
+class AsyncJWTCookieAuthentication(JWTCookieAuthentication):
+    """
+    `JWTCookieAuthentication` with an `aauthenticate()` for async views.
+
+    Reading and validating the token is CPU-only and shared with the sync
+    path; only the user lookup goes through the async ORM.
+    """
+
+    async def aauthenticate(self, request):
+        raw_token = self.get_request_token(request)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+
+    def get_request_token(self, request):
+        """The raw token from the `Authorization` header, else the cookie."""
+        header = self.get_header(request)
+        if header is not None:
+            return self.get_raw_token(header)
+
+        cookie_name = rest_auth_settings.JWT_AUTH_COOKIE
+        if not cookie_name:
+            return None
+        raw_token = request.COOKIES.get(cookie_name)
+        if rest_auth_settings.JWT_AUTH_COOKIE_ENFORCE_CSRF_ON_UNAUTHENTICATED or (
+            raw_token is not None and rest_auth_settings.JWT_AUTH_COOKIE_USE_CSRF
+        ):
+            self.enforce_csrf(request)
+        return raw_token
+
+    async def aget_user(self, validated_token):
+        """`get_user()` with the async ORM."""
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification")
+            ) from e
+
+        try:
+            user = await self.user_model.objects.aget(
+                **{api_settings.USER_ID_FIELD: user_id}
+            )
+        except self.user_model.DoesNotExist as e:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found") from e
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(
+                api_settings.REVOKE_TOKEN_CLAIM
+            ) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code="password_changed"
+                )
+
+        return user
+
+
+class StatelessJWTCookieAuthentication(AsyncJWTCookieAuthentication):
+    """
+    Authenticate from the signed claims alone, as a `TokenUser`, without
+    loading the user row.
+
+    Tokens issued before a user was deactivated, deleted or had their
+    permissions changed are rejected through `sweasy.revocation`. Tokens
+    without a version claim, issued before this class existed, still go
+    through the database.
+    """
+
+    def get_user(self, validated_token):
+        if TOKEN_VERSION_CLAIM not in validated_token:
+            return super().get_user(validated_token)
+        user = self.get_token_user(validated_token)
+        if revocation.is_revoked(user.id, validated_token[TOKEN_VERSION_CLAIM]):
+            raise AuthenticationFailed(_("Token has been revoked"), code="token_revoked")
+        return user
+
+    async def aget_user(self, validated_token):
+        if TOKEN_VERSION_CLAIM not in validated_token:
+            return await super().aget_user(validated_token)
+        user = self.get_token_user(validated_token)
+        if await revocation.ais_revoked(user.id, validated_token[TOKEN_VERSION_CLAIM]):
+            raise AuthenticationFailed(_("Token has been revoked"), code="token_revoked")
+        return user
+
+    def get_token_user(self, validated_token):
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+        if api_settings.CHECK_USER_IS_ACTIVE and not validated_token.get("is_active"):
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return api_settings.TOKEN_USER_CLASS(validated_token)
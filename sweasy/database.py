@@ -0,0 +1,77 @@
+from pathlib import Path
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+ENGINES = {
+    "sqlite": "django.db.backends.sqlite3",
+    "postgres": "django.db.backends.postgresql",
+    "postgresql": "django.db.backends.postgresql",
+    "mysql": "django.db.backends.mysql",
+}
+
+# Applied to every SQLite connection when it is opened. WAL lets readers run
+# alongside the writer, and synchronous=NORMAL is durable enough in WAL mode.
+# Write transactions take the write lock up front (BEGIN IMMEDIATE), so a
+# second writer waits for up to `timeout` seconds instead of failing with
+# "database is locked" when its read lock cannot be upgraded.
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "mmap_size": 256 * 1024 * 1024,
+    "cache_size": -64 * 1024,  # in KiB
+}
+SQLITE_OPTIONS = {
+    "transaction_mode": "IMMEDIATE",
+    "timeout": 20,  # busy_timeout, in seconds
+    "init_command": "; ".join(
+        f"PRAGMA {name}={value}" for name, value in SQLITE_PRAGMAS.items()
+    ),
+}
+
+
+def database_config(url, conn_max_age=0, health_checks=False, pool=False):
+    """
+    A `DATABASES` entry from a URL such as ``postgres://user:pw@host:5432/db``
+    or ``sqlite:////var/lib/sweasy/db.sqlite3``. Query parameters become
+    `OPTIONS`, e.g. ``?sslmode=require``. SQLite connections get
+    `SQLITE_OPTIONS` unless the URL overrides them.
+
+    `pool` uses the connection pool of the PostgreSQL backend, which
+    replaces persistent connections.
+    """
+    parts = urlsplit(url)
+    if parts.scheme not in ENGINES:
+        raise ValueError(f"Unsupported database URL scheme: {parts.scheme!r}")
+
+    options = dict(parse_qsl(parts.query))
+    if parts.scheme == "sqlite":
+        # sqlite:///relative/path or sqlite:////absolute/path
+        options = {**SQLITE_OPTIONS, **options}
+        options["timeout"] = float(options["timeout"])
+        name = unquote(parts.path[1:]) or ":memory:"
+        config = {
+            "ENGINE": ENGINES["sqlite"],
+            "NAME": name,
+            "OPTIONS": options,
+            "CONN_MAX_AGE": conn_max_age,
+            "CONN_HEALTH_CHECKS": health_checks,
+        }
+        if name != ":memory:":
+            # Test on a file too: an in-memory database shares one cache
+            # between connections and locks differently.
+            config["TEST"] = {"NAME": str(Path(name).with_suffix(".test.sqlite3"))}
+        return config
+
+    if pool and parts.scheme != "mysql":
+        options["pool"] = True
+        conn_max_age = 0
+    return {
+        "ENGINE": ENGINES[parts.scheme],
+        "NAME": unquote(parts.path.lstrip("/")),
+        "USER": unquote(parts.username or ""),
+        "PASSWORD": unquote(parts.password or ""),
+        "HOST": parts.hostname or "",
+        "PORT": str(parts.port or ""),
+        "OPTIONS": options,
+        "CONN_MAX_AGE": conn_max_age,
+        "CONN_HEALTH_CHECKS": health_checks,
+    }
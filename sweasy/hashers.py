@@ -0,0 +1,135 @@
+import base64
+import functools
+import hashlib
+import math
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from django.contrib.auth import password_validation
+from django.contrib.auth.hashers import PBKDF2PasswordHasher, must_update_salt
+from django.utils.crypto import get_random_string
+from django.utils.encoding import force_bytes
+
+# Iterations timed to calibrate.
+SAMPLE_ITERATIONS = 50_000
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+@functools.cache
+def calibrated_iterations():
+    """
+    The PBKDF2-SHA256 iterations that take `PASSWORD_HASHING_TARGET_MS` on
+    this machine, never fewer than `PASSWORD_HASHING_MIN_ITERATIONS`.
+    `PASSWORD_HASHING_ITERATIONS` skips the measurement. Measured once per
+    process.
+    """
+    if settings.PASSWORD_HASHING_ITERATIONS:
+        return settings.PASSWORD_HASHING_ITERATIONS
+    salt = get_random_string(22).encode()
+    elapsed = min(
+        _timed(hashlib.pbkdf2_hmac, "sha256", b"calibration", salt, SAMPLE_ITERATIONS)
+        for _ in range(3)
+    )
+    target = settings.PASSWORD_HASHING_TARGET_MS / 1000
+    # Rounded, so that pods of the same kind agree on the cost.
+    iterations = math.ceil(SAMPLE_ITERATIONS * target / elapsed / 10_000) * 10_000
+    return max(settings.PASSWORD_HASHING_MIN_ITERATIONS, iterations)
+
+
+def _timed(func, *args):
+    started = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - started
+
+
+def get_pool():
+    """
+    The process pool that hashes run in, of `PASSWORD_HASHING_WORKERS`
+    processes, or None to hash in the calling thread. Created on first use in
+    each process, so that forked servers do not share their parent's.
+    """
+    global _pool, _pool_pid
+    if not settings.PASSWORD_HASHING_WORKERS:
+        return None
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.PASSWORD_HASHING_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            _pool_pid = os.getpid()
+        return _pool
+
+
+def _discard_pool(pool):
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def derive(password, salt, iterations, digest="sha256"):
+    """PBKDF2 of `password`, in the pool when there is one."""
+    args = (digest, force_bytes(password), force_bytes(salt), iterations)
+    pool = get_pool()
+    if pool is None:
+        return hashlib.pbkdf2_hmac(*args)
+    try:
+        # Waiting releases the GIL; the hash runs in another process.
+        return pool.submit(hashlib.pbkdf2_hmac, *args).result()
+    except BrokenProcessPool:
+        _discard_pool(pool)
+        return hashlib.pbkdf2_hmac(*args)
+
+
+def warm_up():
+    """
+    Calibrate, start the pool and load the password validators (their word
+    lists included) before the first request needs them.
+    """
+    password_validation.get_default_password_validators()
+    calibrated_iterations()
+    pool = get_pool()
+    if pool is not None:
+        pool.submit(hashlib.pbkdf2_hmac, "sha256", b"", b"", 1).result()
+
+
+class PooledPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    PBKDF2-SHA256, computed in a process pool, with its iterations calibrated
+    to the machine (see `calibrated_iterations()`).
+
+    Hashes are the same as Django's `PBKDF2PasswordHasher`'s. A password is
+    rehashed on login when its iterations are more than
+    `PASSWORD_HASHING_TOLERANCE` below the calibrated ones, so that pods
+    measuring slightly different costs do not rehash each other's. Stronger
+    hashes are kept, whatever this machine measures.
+    """
+
+    @property
+    def iterations(self):
+        return calibrated_iterations()
+
+    def encode(self, password, salt, iterations=None):
+        self._check_encode_args(password, salt)
+        iterations = iterations or self.iterations
+        hash = derive(password, salt, iterations, digest=self.digest().name)
+        hash = base64.b64encode(hash).decode("ascii").strip()
+        return "%s$%d$%s$%s" % (self.algorithm, iterations, salt, hash)
+
+    def must_update(self, encoded):
+        decoded = self.decode(encoded)
+        shortfall = self.iterations - decoded["iterations"]
+        return (
+            shortfall > self.iterations * settings.PASSWORD_HASHING_TOLERANCE
+            or must_update_salt(decoded["salt"], self.salt_entropy)
+        )
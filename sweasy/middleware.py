@@ -0,0 +1,130 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.handlers.base import BaseHandler
+from django.core.handlers.exception import convert_exception_to_response
+from django.middleware.gzip import GZipMiddleware
+from django.utils.decorators import sync_and_async_middleware
+from django.utils.module_loading import import_string
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+    Gzip dynamic responses of at least `GZIP_MIN_LENGTH` bytes, streaming
+    ones included.
+
+    Responses that already carry a `Content-Encoding` (such as precompressed
+    chapter content) and partial responses are passed through untouched.
+    Responses compressed here lose their `Accept-Ranges`: byte ranges of the
+    identity body would not address the gzipped one.
+    """
+
+    def process_response(self, request, response):
+        if response.status_code == 206 or response.has_header("Content-Encoding"):
+            return response
+        if response.streaming:
+            length = response.get("Content-Length")
+            length = int(length) if length else None
+        else:
+            length = len(response.content)
+        if length is not None and length < settings.GZIP_MIN_LENGTH:
+            return response
+        response = super().process_response(request, response)
+        if response.has_header("Content-Encoding"):
+            del response["Accept-Ranges"]
+        return response
+
+
+class ProfileHandler(BaseHandler):
+    """
+    A request handler with its own middleware list, for `ProfileMiddleware`.
+
+    `load_middleware()` is `BaseHandler.load_middleware()` over `middleware`
+    instead of `settings.MIDDLEWARE`, so the view, template response and
+    exception hooks of the profile run exactly as they would at the top level.
+    """
+
+    def __init__(self, middleware):
+        self.middleware = middleware
+
+    def load_middleware(self, is_async=False):
+        self._view_middleware = []
+        self._template_response_middleware = []
+        self._exception_middleware = []
+
+        get_response = self._get_response_async if is_async else self._get_response
+        handler = convert_exception_to_response(get_response)
+        handler_is_async = is_async
+        for middleware_path in reversed(self.middleware):
+            middleware = import_string(middleware_path)
+            middleware_can_sync = getattr(middleware, "sync_capable", True)
+            middleware_can_async = getattr(middleware, "async_capable", False)
+            if not handler_is_async and middleware_can_sync:
+                middleware_is_async = False
+            else:
+                middleware_is_async = middleware_can_async
+            try:
+                adapted_handler = self.adapt_method_mode(
+                    middleware_is_async, handler, handler_is_async
+                )
+                mw_instance = middleware(adapted_handler)
+            except MiddlewareNotUsed:
+                continue
+            handler = adapted_handler
+
+            if hasattr(mw_instance, "process_view"):
+                self._view_middleware.insert(
+                    0, self.adapt_method_mode(is_async, mw_instance.process_view)
+                )
+            if hasattr(mw_instance, "process_template_response"):
+                self._template_response_middleware.append(
+                    self.adapt_method_mode(is_async, mw_instance.process_template_response)
+                )
+            if hasattr(mw_instance, "process_exception"):
+                self._exception_middleware.append(
+                    self.adapt_method_mode(False, mw_instance.process_exception)
+                )
+
+            handler = convert_exception_to_response(mw_instance)
+            handler_is_async = middleware_is_async
+
+        self._middleware_chain = self.adapt_method_mode(is_async, handler, handler_is_async)
+
+
+@sync_and_async_middleware
+class ProfileMiddleware:
+    """
+    Serve requests under the path prefixes of `MIDDLEWARE_PROFILES` through
+    the middleware list of their profile instead of the rest of `MIDDLEWARE`.
+
+    JSON endpoints authenticated by JWT have no use for sessions, messages or
+    allauth; their profile leaves them out. The longest matching prefix wins,
+    and other requests continue down `MIDDLEWARE` as usual.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+        self.profiles = []
+        for prefix, middleware in sorted(
+            settings.MIDDLEWARE_PROFILES.items(), key=lambda item: -len(item[0])
+        ):
+            handler = ProfileHandler(middleware)
+            handler.load_middleware(is_async=self.is_async)
+            self.profiles.append((prefix, handler._middleware_chain))
+
+    def get_chain(self, request):
+        for prefix, chain in self.profiles:
+            if request.path_info.startswith(prefix):
+                return chain
+        return self.get_response
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        return self.get_chain(request)(request)
+
+    async def __acall__(self, request):
+        return await self.get_chain(request)(request)
@@ -0,0 +1,213 @@
+import base64
+import json
+from collections import OrderedDict
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from django.http import StreamingHttpResponse
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from sweasy.renderers import dumps
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination over a unique, ascending ordering such as
+    ``("number", "id")``.
+
+    The cursor stores the full key of the boundary row, so every page is a
+    single range scan on the matching index, however deep the page is and
+    however many rows share the leading column. Views may override the
+    ordering with an ``ordering`` attribute.
+    """
+
+    cursor_query_param = "cursor"
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = ("number", "id")
+    invalid_cursor_message = "Invalid cursor"
+    # Rows fetched at a time by `stream_paginated_response()`.
+    chunk_size = 500
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset, reverse, position = self._prepare(queryset, request, view)
+        results = list(queryset[: self.page_size + 1])
+        return self._page(results, reverse, position)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """`paginate_queryset()` for async views, with the async ORM."""
+        queryset, reverse, position = self._prepare(queryset, request, view)
+        results = [row async for row in queryset[: self.page_size + 1]]
+        return self._page(results, reverse, position)
+
+    def stream_paginated_response(self, queryset, serializer, request, view=None):
+        """
+        A page of `queryset` as a streamed JSON response, in the envelope of
+        `get_paginated_data()`. Rows are read with ``values()`` and rendered
+        with the readable fields of `serializer`, `chunk_size` at a time, so
+        memory stays flat however large the page is. The links are found
+        first, from the keys of the page's boundary rows. Only backward pages,
+        which are fetched in reverse, are held in memory.
+        """
+        fields = [field for field in serializer.fields.values() if not field.write_only]
+        queryset, reverse, position = self._prepare(queryset, request, view)
+        queryset = queryset.values(
+            *dict.fromkeys([*(field.source for field in fields), *self.ordering])
+        )
+        rows = queryset[: self.page_size + 1]
+        if reverse:
+            rows = self._page(list(rows), reverse, position)
+        else:
+            self._find_links(queryset, position)
+            rows = rows[: self.page_size].iterator(chunk_size=self.chunk_size)
+        return StreamingHttpResponse(
+            self._render(rows, fields), content_type="application/json"
+        )
+
+    def _find_links(self, queryset, position):
+        keys = queryset.values_list(*self.ordering)
+        self.previous_position = keys.first() if position is not None else None
+        boundary = list(keys[self.page_size - 1 : self.page_size + 1])
+        self.next_position = boundary[0] if len(boundary) > 1 else None
+
+    def _render(self, rows, fields):
+        yield b'{"next":%s,"previous":%s,"results":[' % (
+            dumps(self.get_next_link()),
+            dumps(self.get_previous_link()),
+        )
+        for count, row in enumerate(rows):
+            data = {
+                field.field_name: None
+                if row[field.source] is None
+                else field.to_representation(row[field.source])
+                for field in fields
+            }
+            yield (b"," if count else b"") + dumps(data)
+        yield b"]}"
+
+    def _prepare(self, queryset, request, view):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.ordering = tuple(getattr(view, "ordering", None) or self.ordering)
+        self.model = queryset.model
+        self.base_url = request.build_absolute_uri()
+
+        cursor = self.decode_cursor(request)
+        reverse, position = cursor if cursor else (False, None)
+
+        if position is not None:
+            queryset = queryset.filter(
+                self._keyset_filter(self.ordering, position, "lt" if reverse else "gt")
+            )
+        if reverse:
+            queryset = queryset.order_by(*(f"-{field}" for field in self.ordering))
+        else:
+            queryset = queryset.order_by(*self.ordering)
+        return queryset, reverse, position
+
+    def _page(self, results, reverse, position):
+        has_more = len(results) > self.page_size
+        results = results[: self.page_size]
+        if reverse:
+            results.reverse()
+
+        self.next_position = self.previous_position = None
+        if results:
+            first, last = self._position(results[0]), self._position(results[-1])
+            if reverse:
+                self.next_position = last
+                self.previous_position = first if has_more else None
+            else:
+                self.next_position = last if has_more else None
+                self.previous_position = first if position is not None else None
+
+        return results
+
+    def get_paginated_response(self, data):
+        return Response(self.get_paginated_data(data))
+
+    def get_paginated_data(self, data):
+        return OrderedDict(
+            [
+                ("next", self.get_next_link()),
+                ("previous", self.get_previous_link()),
+                ("results", data),
+            ]
+        )
+
+    def get_page_size(self, request):
+        page_size = self.page_size
+        raw = request.query_params.get(self.page_size_query_param)
+        if raw is not None:
+            try:
+                requested = int(raw)
+            except ValueError:
+                requested = 0
+            if requested > 0:
+                page_size = requested
+        return min(page_size, self.max_page_size)
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        return self.encode_cursor(False, self.next_position)
+
+    def get_previous_link(self):
+        if self.previous_position is None:
+            return None
+        return self.encode_cursor(True, self.previous_position)
+
+    def encode_cursor(self, reverse, position):
+        payload = json.dumps([int(reverse), list(position)], separators=(",", ":"))
+        encoded = base64.urlsafe_b64encode(payload.encode()).decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            reverse, position = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if reverse not in (0, 1) or isinstance(reverse, bool):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return bool(reverse), self._clean_position(position)
+
+    def _clean_position(self, position):
+        # Cursors come from clients: each value must be a non-null value of
+        # its ordering field, or the filter would fail in the database.
+        cleaned = []
+        for field, value in zip(self.ordering, position):
+            try:
+                value = self.model._meta.get_field(field).to_python(value)
+            except (FieldDoesNotExist, ValidationError, TypeError, ValueError):
+                raise NotFound(self.invalid_cursor_message)
+            if value is None or isinstance(value, (list, dict)):
+                raise NotFound(self.invalid_cursor_message)
+            cleaned.append(value)
+        return tuple(cleaned)
+
+    def _position(self, obj):
+        if isinstance(obj, dict):
+            return tuple(obj[field] for field in self.ordering)
+        return tuple(getattr(obj, field) for field in self.ordering)
+
+    @classmethod
+    def _keyset_filter(cls, fields, values, op):
+        # (a, b) > (x, y)  ==>  a >= x AND (a > x OR (a = x AND b > y))
+        # The leading inclusive bound lets the database seek on the index.
+        head, *tail = fields
+        value, *rest = values
+        if not tail:
+            return Q(**{f"{head}__{op}": value})
+        return Q(**{f"{head}__{op}e": value}) & (
+            Q(**{f"{head}__{op}": value})
+            | (Q(**{head: value}) & cls._keyset_filter(tail, rest, op))
+        )
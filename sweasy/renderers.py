@@ -0,0 +1,84 @@
+import json
+
+from django.conf import settings
+from rest_framework import renderers, parsers
+from rest_framework.exceptions import ParseError
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+_encoder = encoders.JSONEncoder()
+
+
+def _default(obj):
+    # Dates, decimals, UUIDs, lazy strings... are encoded the way DRF does.
+    return _encoder.default(obj)
+
+
+def dumps(data):
+    """
+    Compact UTF-8 JSON of `data` as `bytes`, with orjson when installed.
+
+    Anything orjson refuses (e.g. integers over 64 bits) goes through the
+    standard library instead, so both paths accept the same data.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(
+                data, default=_default, option=orjson.OPT_PASSTHROUGH_DATETIME
+            )
+        except orjson.JSONEncodeError:
+            pass
+    return json.dumps(
+        data,
+        cls=encoders.JSONEncoder,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+    ).encode()
+
+
+def loads(data):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data, parse_constant=_reject_constant)
+
+
+def _reject_constant(name):
+    raise ValueError(f"Invalid JSON constant: {name}")
+
+
+class FastJSONRenderer(renderers.BaseRenderer):
+    """
+    Compact JSON, without DRF's `indent` negotiation. Uses orjson when it is
+    installed and the standard library otherwise.
+    """
+
+    media_type = "application/json"
+    format = "json"
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return dumps(data)
+
+
+class FastJSONParser(parsers.BaseParser):
+    """Parse JSON request bodies, with orjson when it is installed."""
+
+    media_type = "application/json"
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get("encoding", settings.DEFAULT_CHARSET)
+        try:
+            data = stream.read() if stream is not None else b""
+            if encoding.lower().replace("-", "") != "utf8":
+                data = data.decode(encoding)
+            return loads(data)
+        except ValueError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
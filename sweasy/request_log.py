@@ -0,0 +1,220 @@
+import atexit
+import json
+import logging
+import queue
+import random
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+from urllib.parse import parse_qsl
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http.request import RawPostDataException
+from django.utils.decorators import sync_and_async_middleware
+
+from sweasy.renderers import dumps
+
+logger = logging.getLogger("sweasy.requests")
+
+REDACTED = "[redacted]"
+# Only bodies whose fields can be redacted are logged; others only by size.
+LOGGED_CONTENT_TYPES = ("application/json", "application/x-www-form-urlencoded")
+
+_listener = None
+_listener_lock = threading.Lock()
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    Hand records to the listener thread. A full queue drops the record
+    instead of blocking the request; `dropped` counts them.
+    """
+
+    dropped = 0
+
+    def prepare(self, record):
+        # Formatting happens on the listener thread.
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            DroppingQueueHandler.dropped += 1
+
+
+class SummarizingQueueListener(QueueListener):
+    """Summarize the bodies of queued records before any handler sees them."""
+
+    def prepare(self, record):
+        return summarize_record(record)
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line: the record's `request`, plus time and level."""
+
+    def format(self, record):
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "message": record.getMessage(),
+            **getattr(record, "request", {}),
+        }
+        return dumps(entry).decode()
+
+
+def start():
+    """
+    Move the handlers of the request logger behind a bounded queue, written
+    by a background thread. Idempotent.
+    """
+    global _listener
+    with _listener_lock:
+        if _listener is not None:
+            return
+        handlers = logger.handlers[:]
+        for handler in handlers:
+            logger.removeHandler(handler)
+        records = queue.Queue(maxsize=settings.REQUEST_LOG_QUEUE_SIZE)
+        logger.addHandler(DroppingQueueHandler(records))
+        _listener = SummarizingQueueListener(records, *handlers, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)
+
+
+def redact(data, fields=None):
+    """`data` with the values of `REQUEST_LOG_REDACTED_FIELDS` hidden, whatever their case."""
+    if fields is None:
+        fields = {field.lower() for field in settings.REQUEST_LOG_REDACTED_FIELDS}
+    if isinstance(data, dict):
+        return {
+            key: REDACTED if str(key).lower() in fields else redact(value, fields)
+            for key, value in data.items()
+        }
+    if isinstance(data, list):
+        return [redact(item, fields) for item in data]
+    return data
+
+
+def summarize_body(body, content_type):
+    """
+    What to log of a body: its size, and its redacted text up to
+    `REQUEST_LOG_BODY_LIMIT` characters when it is JSON or a form no larger
+    than `REQUEST_LOG_MAX_BODY` bytes.
+    """
+    summary = {"size": len(body)}
+    if not body or len(body) > settings.REQUEST_LOG_MAX_BODY:
+        return summary
+    if not content_type.startswith(LOGGED_CONTENT_TYPES):
+        return summary
+    try:
+        text = body.decode()
+        if content_type.startswith("application/json"):
+            text = dumps(redact(json.loads(text))).decode()
+        else:
+            text = dumps(redact(dict(parse_qsl(text)))).decode()
+    except ValueError:
+        return summary
+    limit = settings.REQUEST_LOG_BODY_LIMIT
+    summary["body"] = text[:limit]
+    if len(text) > limit:
+        summary["truncated"] = True
+    return summary
+
+
+def raw_body(body, content_type):
+    """
+    A body to summarize later: the bytes themselves when `summarize_body()`
+    may log them, else only their size.
+    """
+    if 0 < len(body) <= settings.REQUEST_LOG_MAX_BODY and content_type.startswith(
+        LOGGED_CONTENT_TYPES
+    ):
+        return (body, content_type)
+    return {"size": len(body)}
+
+
+def summarize_record(record):
+    """Replace the raw bodies of a request record by their summaries."""
+    entry = getattr(record, "request", {})
+    for name in ("request_body", "response_body"):
+        if isinstance(entry.get(name), tuple):
+            entry[name] = summarize_body(*entry[name])
+    return record
+
+
+@sync_and_async_middleware
+class RequestLogMiddleware:
+    """
+    Log a sample of requests as structured records, without blocking on I/O.
+
+    `REQUEST_LOG_SAMPLE_RATE` of the requests are logged, server errors
+    always. Bodies are summarized by `summarize_body()`: passwords and tokens
+    are redacted, large or binary bodies reduced to their size, and streamed
+    responses never read. Records go through a bounded queue to a background
+    thread (see `start()`), which summarizes the bodies, then formats and
+    writes the records: the request thread only keeps a reference to them.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+        start()
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        sampled, started, body = self.before(request)
+        response = self.get_response(request)
+        self.after(request, response, sampled, started, body)
+        return response
+
+    async def __acall__(self, request):
+        sampled, started, body = self.before(request)
+        response = await self.get_response(request)
+        self.after(request, response, sampled, started, body)
+        return response
+
+    def before(self, request):
+        sampled = random.random() < settings.REQUEST_LOG_SAMPLE_RATE
+        body = None
+        if sampled:
+            # Read now: the view may consume the stream. Large bodies are only
+            # measured.
+            length = int(request.META.get("CONTENT_LENGTH") or 0)
+            if 0 < length <= settings.REQUEST_LOG_MAX_BODY:
+                try:
+                    body = raw_body(request.body, request.content_type or "")
+                except RawPostDataException:
+                    body = {"size": length}
+            elif length:
+                body = {"size": length}
+        return sampled, time.perf_counter(), body
+
+    def after(self, request, response, sampled, started, body):
+        if not (sampled or response.status_code >= 500):
+            return
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        entry = {
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+        }
+        if body is not None:
+            entry["request_body"] = body
+        if not response.streaming and not response.has_header("Content-Encoding"):
+            entry["response_body"] = raw_body(
+                response.content, response.get("Content-Type", "")
+            )
+        logger.info(
+            "%s %s %s",
+            request.method,
+            request.path,
+            response.status_code,
+            extra={"request": entry},
+        )
@@ -0,0 +1,37 @@
+import sys
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework_simplejwt.settings import api_settings
+
+# Version that no token carries: rejects every token of a deleted user.
+ALL_VERSIONS = sys.maxsize
+
+
+def get_cache():
+    return caches[settings.TOKEN_REVOCATION_CACHE_ALIAS]
+
+
+def _key(user_id):
+    return f"token-version:{user_id}"
+
+
+def _timeout():
+    # Every token that predates a revocation has expired by then, access
+    # tokens refreshed from an old refresh token included.
+    return int(api_settings.REFRESH_TOKEN_LIFETIME.total_seconds())
+
+
+def revoke(user_id, version=ALL_VERSIONS):
+    """Reject the tokens of `user_id` that carry a version below `version`."""
+    get_cache().set(_key(user_id), version, _timeout())
+
+
+def is_revoked(user_id, version):
+    minimum = get_cache().get(_key(user_id))
+    return minimum is not None and version < minimum
+
+
+async def ais_revoked(user_id, version):
+    minimum = await get_cache().aget(_key(user_id))
+    return minimum is not None and version < minimum
@@ -0,0 +1,60 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# Apps whose reads may be served by a replica. Everything else, accounts and
+# authentication included, always uses the primary.
+REPLICA_APPS = {"catalog"}
+
+_pinned = ContextVar("pinned_to_primary", default=False)
+
+
+@contextmanager
+def primary():
+    """Send every read of the enclosed block, sync or async, to the primary."""
+    token = _pinned.set(True)
+    try:
+        yield
+    finally:
+        _pinned.reset(token)
+
+
+class PrimaryReplicaRouter:
+    """
+    Send catalog reads to a random replica and every write, every read of
+    other apps, every read inside a transaction and every read inside
+    `primary()` to the primary.
+
+    Replicas are the `DATABASES` aliases listed in `DATABASE_REPLICAS`.
+    Migrations only run on the primary.
+    """
+
+    def replicas(self):
+        return getattr(settings, "DATABASE_REPLICAS", [])
+
+    def db_for_read(self, model, **hints):
+        replicas = self.replicas()
+        if not replicas or model._meta.app_label not in REPLICA_APPS:
+            return DEFAULT_DB_ALIAS
+        if _pinned.get():
+            return DEFAULT_DB_ALIAS
+        # Read your own writes: a transaction only sees its own changes on
+        # the primary.
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        pool = {DEFAULT_DB_ALIAS, *self.replicas()}
+        if obj1._state.db in pool and obj2._state.db in pool:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
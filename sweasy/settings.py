@@ -1,10 +1,17 @@
 import os
+import sys
 from pathlib import Path
+from django.core.exceptions import ImproperlyConfigured
 from dotenv import load_dotenv
 
+from sweasy.database import database_config
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 load_dotenv(dotenv_path=os.path.join(BASE_DIR, ".env"))
 
+# Whether this process runs the test suite (`manage.py test`).
+TESTING = sys.argv[1:2] == ["test"]
+
 # SECURITY WARNING: keep the secret key used in production secret.
 SECRET_KEY = os.getenv("SECRET_KEY")
 
@@ -40,6 +47,8 @@ INSTALLED_APPS = [
     "allauth.socialaccount",
     "catalog",
     "accounts",
+    # Background jobs, run by `manage.py run_jobs`.
+    "jobs",
     # 'django.contrib.admin',
     # Authentication framework and its default models.
     # - Four default permissions are created for each model (add, change, delete, view)
@@ -62,6 +71,34 @@ ACCOUNT_SIGNUP_FIELDS = ["email*", "password1*", "password2*", "username*"]
 ACCOUNT_LOGIN_METHODS = {"email", "username"}
 ACCOUNT_EMAIL_VERIFICATION = "mandatory"
 EMAIL_REQUIRED = True
+# Generic registration answers ("created", duplicates included) are delayed to
+# take at least REGISTRATION_RESPONSE_TIME seconds, so that their timing does
+# not tell whether an account exists. By default 1.5 times a password hash.
+REGISTRATION_RESPONSE_TIME = (
+    float(os.environ["REGISTRATION_RESPONSE_TIME"])
+    if os.getenv("REGISTRATION_RESPONSE_TIME")
+    else None
+)
+# Queues allauth's e-mails as background jobs instead of sending them inline.
+ACCOUNT_ADAPTER = "accounts.adapter.AccountAdapter"
+
+# Deleted accounts (see DestroyMeView) are purged by a periodic job once they
+# have been deactivated for ACCOUNT_DELETION_DELAY seconds.
+ACCOUNT_DELETION_DELAY = int(os.getenv("ACCOUNT_DELETION_DELAY", 0))
+ACCOUNT_PURGE_BATCH_SIZE = 500
+
+# Background jobs (see `jobs`). A failed job is retried JOBS_MAX_ATTEMPTS times
+# in all, after JOBS_BACKOFF_BASE seconds, then twice as long each time, up to
+# JOBS_BACKOFF_MAX. JOBS_PERIODIC maps tasks to the seconds between two runs.
+JOBS_BATCH_SIZE = int(os.getenv("JOBS_BATCH_SIZE", 20))
+JOBS_POLL_INTERVAL = float(os.getenv("JOBS_POLL_INTERVAL", 1))
+JOBS_MAX_ATTEMPTS = 5
+JOBS_BACKOFF_BASE = 30
+JOBS_BACKOFF_MAX = 60 * 60
+JOBS_LOCK_TIMEOUT = 10 * 60
+JOBS_PERIODIC = {
+    "accounts.tasks.purge_deactivated_users": 60 * 60,
+}
 
 
 REST_AUTH = {
@@ -70,14 +107,44 @@ REST_AUTH = {
     "JWT_AUTH_REFRESH_COOKIE": "sweasy-refresh-jwt",
     "TOKEN_MODEL": None,  # Leave None if not importing rest_framework.authtoken
     "SESSION_LOGIN": False,
-    # 'REGISTER_SERIALIZER': 'accounts.serializers.CustomRegisterSerializer',
+    # Adds the claims that the catalog's stateless authentication trusts.
+    "JWT_TOKEN_CLAIMS_SERIALIZER": "sweasy.authentication.ClaimsTokenObtainPairSerializer",
+    "REGISTER_SERIALIZER": "accounts.serializers.CustomRegisterSerializer",
     # 'LOGIN_SERIALIZER': 'accounts.serializers.CustomLoginSerializer',
 }
 
+# JSON is rendered and parsed by `sweasy.renderers` (orjson when installed,
+# compact stdlib json otherwise). Set API_JSON_BACKEND=drf to go back to DRF's
+# own JSONRenderer and JSONParser. The browsable API is only served with DEBUG.
+API_JSON_BACKEND = os.getenv("API_JSON_BACKEND", "fast")
+
+if API_JSON_BACKEND == "drf":
+    API_RENDERER_CLASSES = ["rest_framework.renderers.JSONRenderer"]
+    API_PARSER_CLASSES = ["rest_framework.parsers.JSONParser"]
+else:
+    API_RENDERER_CLASSES = ["sweasy.renderers.FastJSONRenderer"]
+    API_PARSER_CLASSES = ["sweasy.renderers.FastJSONParser"]
+
+if DEBUG:
+    API_RENDERER_CLASSES.append("rest_framework.renderers.BrowsableAPIRenderer")
+
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "dj_rest_auth.jwt_auth.JWTCookieAuthentication",
+        # JWTCookieAuthentication, plus an async path for `catalog.async_views`.
+        "sweasy.authentication.AsyncJWTCookieAuthentication",
     ),
+    # Only throttles the views listed in THROTTLE_BUCKETS.
+    "DEFAULT_THROTTLE_CLASSES": ["sweasy.throttling.TokenBucketThrottle"],
+    # Reverse proxies in front of the app. Throttles key clients on the address
+    # the last of them saw in X-Forwarded-For, or on REMOTE_ADDR with none:
+    # the header is never trusted further than the proxies that append to it.
+    "NUM_PROXIES": int(os.getenv("NUM_PROXIES", 0)),
+    "DEFAULT_RENDERER_CLASSES": API_RENDERER_CLASSES,
+    "DEFAULT_PARSER_CLASSES": API_PARSER_CLASSES
+    + [
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
 }
 
 # In case you need to point these to your own frontend application, you can do
@@ -96,7 +163,11 @@ REST_FRAMEWORK = {
 HEADLESS_ONLY = True
 
 MIDDLEWARE = [
-    "request_logging.middleware.LoggingMiddleware",
+    # Compresses responses last, after every other middleware read them.
+    "sweasy.middleware.CompressionMiddleware",
+    # Sends the requests of MIDDLEWARE_PROFILES down their own, shorter list.
+    "sweasy.middleware.ProfileMiddleware",
+    "sweasy.request_log.RequestLogMiddleware",
     "django.middleware.security.SecurityMiddleware",
     # Manages sessions across requests.
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -109,6 +180,69 @@ MIDDLEWARE = [
     "allauth.account.middleware.AccountMiddleware",
 ]
 
+# The middleware that replaces the rest of MIDDLEWARE for requests under a path
+# prefix. The catalog is authenticated by JWT only (DRF enforces CSRF for the
+# cookie itself), so it skips sessions, CSRF, messages and allauth.
+MIDDLEWARE_PROFILES = {
+    "/api/v1/catalog/": [
+        "sweasy.request_log.RequestLogMiddleware",
+        "django.middleware.security.SecurityMiddleware",
+        "django.middleware.common.CommonMiddleware",
+        "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    ],
+}
+
+# Requests are logged by `sweasy.request_log` as JSON lines on stderr, written
+# by a background thread. REQUEST_LOG_SAMPLE_RATE of the requests are logged
+# (server errors always). JSON and form bodies up to REQUEST_LOG_MAX_BODY bytes
+# are logged, with REQUEST_LOG_REDACTED_FIELDS redacted whatever their case, and
+# cut to REQUEST_LOG_BODY_LIMIT characters; other bodies only by size. When REQUEST_LOG_QUEUE_SIZE records are waiting, new ones are dropped.
+# Waiting records hold their bodies until the background thread summarizes
+# them: up to twice REQUEST_LOG_MAX_BODY bytes each.
+REQUEST_LOG_SAMPLE_RATE = float(os.getenv("REQUEST_LOG_SAMPLE_RATE", 1.0))
+REQUEST_LOG_MAX_BODY = int(os.getenv("REQUEST_LOG_MAX_BODY", 64 * 1024))
+REQUEST_LOG_BODY_LIMIT = int(os.getenv("REQUEST_LOG_BODY_LIMIT", 1024))
+REQUEST_LOG_QUEUE_SIZE = int(os.getenv("REQUEST_LOG_QUEUE_SIZE", 1_000))
+REQUEST_LOG_REDACTED_FIELDS = {
+    "password",
+    "password1",
+    "password2",
+    "old_password",
+    "new_password1",
+    "new_password2",
+    "access",
+    "refresh",
+    "token",
+    "key",
+}
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {
+        "request": {"()": "sweasy.request_log.JSONFormatter"},
+    },
+    "handlers": {
+        "requests": {"class": "logging.StreamHandler", "formatter": "request"},
+    },
+    "loggers": {
+        "sweasy.requests": {
+            "handlers": ["requests"],
+            # Test runs only log requests where a test asks for them.
+            "level": "WARNING" if TESTING else os.getenv("REQUEST_LOG_LEVEL", "INFO"),
+            "propagate": False,
+        },
+    },
+}
+
+# Serve the catalog read endpoints from `catalog.async_views` instead of DRF.
+# `sweasy/asgi.py` turns this on, WSGI deployments keep the DRF views.
+CATALOG_ASYNC_VIEWS = os.getenv("CATALOG_ASYNC_VIEWS") == "1"
+
+# Responses smaller than this are not worth compressing on the fly. Chapter
+# documents are compressed when they are written, see `catalog.content`.
+GZIP_MIN_LENGTH = int(os.getenv("GZIP_MIN_LENGTH", 1024))
+
 ROOT_URLCONF = "sweasy.urls"
 
 TEMPLATES = [
@@ -140,11 +274,125 @@ WSGI_APPLICATION = "sweasy.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# The primary comes from DATABASE_URL (SQLite in the project directory by
+# default) and read replicas from the comma-separated DATABASE_REPLICA_URLS.
+# Connections are kept open for DATABASE_CONN_MAX_AGE seconds and checked
+# before reuse; DATABASE_POOL=1 uses the PostgreSQL connection pool instead.
+DATABASE_URL = os.getenv("DATABASE_URL", f"sqlite:///{BASE_DIR / 'db.sqlite3'}")
+DATABASE_REPLICA_URLS = [
+    url for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url
+]
+DATABASE_CONN_MAX_AGE = int(os.getenv("DATABASE_CONN_MAX_AGE", 60))
+DATABASE_POOL = os.getenv("DATABASE_POOL") == "1"
+
 DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": os.path.join(BASE_DIR, "db.sqlite3"),
+    "default": database_config(
+        DATABASE_URL,
+        conn_max_age=DATABASE_CONN_MAX_AGE,
+        health_checks=True,
+        pool=DATABASE_POOL,
+    ),
+}
+# Replicas mirror the primary in tests, so test data is visible on both.
+DATABASE_REPLICAS = []
+for number, url in enumerate(DATABASE_REPLICA_URLS, start=1):
+    alias = f"replica{number}"
+    DATABASES[alias] = database_config(
+        url,
+        conn_max_age=DATABASE_CONN_MAX_AGE,
+        health_checks=True,
+        pool=DATABASE_POOL,
+    )
+    DATABASES[alias]["TEST"] = {"MIRROR": "default"}
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ["sweasy.routers.PrimaryReplicaRouter"]
+# Catalog responses are read from the primary for this many seconds after a
+# write they depend on, before they get cached (see catalog.cache). Keep it
+# above the worst replication lag.
+DATABASE_REPLICA_LAG = float(os.getenv("DATABASE_REPLICA_LAG", 5))
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+# Catalog responses are cached in local memory unless CATALOG_CACHE_URL points
+# to a Redis server ("redis://host:6379/0") or a directory ("file:///var/tmp/x").
+CATALOG_CACHE_ALIAS = "catalog"
+CATALOG_CACHE_URL = os.getenv("CATALOG_CACHE_URL", "")
+CATALOG_CACHE_TIMEOUT = int(os.getenv("CATALOG_CACHE_TIMEOUT", 60 * 60))
+
+if CATALOG_CACHE_URL.startswith(("redis://", "rediss://")):
+    CATALOG_CACHE = {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": CATALOG_CACHE_URL,
+    }
+elif CATALOG_CACHE_URL.startswith("file://"):
+    CATALOG_CACHE = {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": CATALOG_CACHE_URL.removeprefix("file://"),
+    }
+else:
+    CATALOG_CACHE = {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "catalog",
+    }
+
+# Revoked JWT versions (see sweasy.revocation) must reach every server process
+# and survive restarts: TOKEN_REVOCATION_CACHE_URL points to a Redis server they
+# share. Only DEBUG and test runs may keep them in process memory.
+TOKEN_REVOCATION_CACHE_ALIAS = "revocations"
+TOKEN_REVOCATION_CACHE_URL = os.getenv("TOKEN_REVOCATION_CACHE_URL", "")
+
+if TOKEN_REVOCATION_CACHE_URL.startswith(("redis://", "rediss://")):
+    TOKEN_REVOCATION_CACHE = {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": TOKEN_REVOCATION_CACHE_URL,
+    }
+elif not (DEBUG or TESTING):
+    raise ImproperlyConfigured(
+        "TOKEN_REVOCATION_CACHE_URL must be a redis:// URL: revocations kept in "
+        "process memory do not reach the other server processes."
+    )
+else:
+    TOKEN_REVOCATION_CACHE = {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "revocations",
+        "OPTIONS": {"MAX_ENTRIES": 100_000},
+    }
+
+# Throttling buckets (see sweasy.throttling) live in process memory, unless
+# THROTTLE_CACHE_URL points to a Redis server that all processes share.
+THROTTLE_CACHE_ALIAS = "throttles"
+THROTTLE_CACHE_URL = os.getenv("THROTTLE_CACHE_URL", "")
+
+if THROTTLE_CACHE_URL.startswith(("redis://", "rediss://")):
+    THROTTLE_CACHE = {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": THROTTLE_CACHE_URL,
+    }
+else:
+    THROTTLE_CACHE = {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "throttles",
+        "OPTIONS": {"MAX_ENTRIES": 100_000},
     }
+
+# POST requests to these views are throttled per client address ("ip") and per
+# "username" and "email" in the request, by token buckets of the given size and
+# refill rate: "5/min" allows bursts of 5 and 5 more each minute.
+THROTTLE_BUCKETS = {
+    "rest_login": {"ip": "30/min", "username": "10/min", "email": "10/min"},
+    "rest_register": {"ip": "10/hour", "username": "5/hour", "email": "5/hour"},
+    "rest_resend_email": {"ip": "10/hour", "email": "3/hour"},
+}
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    CATALOG_CACHE_ALIAS: CATALOG_CACHE,
+    TOKEN_REVOCATION_CACHE_ALIAS: TOKEN_REVOCATION_CACHE,
+    THROTTLE_CACHE_ALIAS: THROTTLE_CACHE,
 }
 
 AUTHENTICATION_BACKENDS = [
@@ -155,6 +403,34 @@ AUTHENTICATION_BACKENDS = [
 ]
 
 
+# Passwords are hashed by `sweasy.hashers`: PBKDF2-SHA256 in a pool of
+# PASSWORD_HASHING_WORKERS processes (0 hashes in the request's thread), with
+# the iterations that take PASSWORD_HASHING_TARGET_MS on the machine, at least
+# PASSWORD_HASHING_MIN_ITERATIONS. PASSWORD_HASHING_ITERATIONS fixes them
+# instead. Passwords hashed with iterations more than PASSWORD_HASHING_TOLERANCE
+# below these are rehashed on login; stronger hashes are kept.
+PASSWORD_HASHERS = [
+    "sweasy.hashers.PooledPBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+]
+# Every server process starts its own pool, so by default the CPUs are split
+# between the WEB_CONCURRENCY processes (as gunicorn reads it) rather than each
+# pool taking all of them.
+PASSWORD_HASHING_WORKERS = int(
+    os.getenv(
+        "PASSWORD_HASHING_WORKERS",
+        max((os.cpu_count() or 1) // int(os.getenv("WEB_CONCURRENCY", 1)), 1),
+    )
+)
+PASSWORD_HASHING_TARGET_MS = float(os.getenv("PASSWORD_HASHING_TARGET_MS", 250))
+PASSWORD_HASHING_MIN_ITERATIONS = 600_000
+PASSWORD_HASHING_ITERATIONS = int(os.getenv("PASSWORD_HASHING_ITERATIONS", 0))
+PASSWORD_HASHING_TOLERANCE = 0.25
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -166,7 +442,7 @@ AUTH_PASSWORD_VALIDATORS = [
         "NAME": "django.contrib.auth.password_validation.MinimumLengthValidator",
     },
     {
-        "NAME": "django.contrib.auth.password_validation.CommonPasswordValidator",
+        "NAME": "accounts.validators.CommonPasswordValidator",
     },
     {
         "NAME": "django.contrib.auth.password_validation.NumericPasswordValidator",
@@ -0,0 +1,82 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.throttling import BaseThrottle
+
+PERIODS = {"s": 1, "sec": 1, "min": 60, "hour": 60 * 60, "day": 24 * 60 * 60}
+
+
+def get_cache():
+    return caches[settings.THROTTLE_CACHE_ALIAS]
+
+
+def parse_rate(rate):
+    """`"5/min"` is a bucket of 5 tokens, refilled at 5 tokens a minute."""
+    tokens, period = rate.split("/")
+    return int(tokens), int(tokens) / PERIODS[period]
+
+
+def _key(endpoint, kind, value):
+    # Hashed: usernames and e-mails are neither logged nor safe cache keys.
+    digest = hashlib.blake2b(value.encode(), digest_size=16).hexdigest()
+    return f"throttle:{endpoint}:{kind}:{digest}"
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Token buckets per client address, username and e-mail, for the views
+    named in `THROTTLE_BUCKETS`. Other views are not throttled. The address
+    is `REMOTE_ADDR`, or the one forwarded by the `NUM_PROXIES` proxies.
+
+    A request takes a token from every bucket it falls in, and is rejected
+    when one of them is empty, before the view does any work. A bucket is a
+    `(tokens, updated)` pair in the `THROTTLE_CACHE_ALIAS` cache, refilled
+    by the time elapsed since it was last taken from: every check is one
+    `get_many()` and a `set()` per bucket. Concurrent requests may both take
+    the last token; the limits are approximate.
+    """
+
+    def allow_request(self, request, view):
+        match = request.resolver_match
+        limits = settings.THROTTLE_BUCKETS.get(match.url_name if match else None)
+        if not limits or request.method != "POST":
+            return True
+        buckets = {}
+        for kind, rate in limits.items():
+            value = self.get_ident(request) if kind == "ip" else self.get_field(request, kind)
+            if value:
+                buckets[_key(match.url_name, kind, value)] = parse_rate(rate)
+        if not buckets:
+            return True
+
+        now = time.time()
+        cache = get_cache()
+        stored = cache.get_many(buckets)
+        levels = {}
+        self.wait_for = 0
+        for key, (capacity, refill) in buckets.items():
+            tokens, updated = stored.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * refill)
+            if tokens < 1:
+                self.wait_for = max(self.wait_for, (1 - tokens) / refill)
+            levels[key] = (tokens - 1, capacity / refill)
+        if self.wait_for:
+            return False
+        # Kept until the bucket would be full again.
+        for key, (tokens, timeout) in levels.items():
+            cache.set(key, (tokens, now), int(timeout) + 1)
+        return True
+
+    def get_field(self, request, field):
+        try:
+            value = request.data.get(field)
+        except AttributeError:
+            return None
+        if not isinstance(value, str):
+            return None
+        return value.strip().lower()
+
+    def wait(self):
+        return self.wait_for
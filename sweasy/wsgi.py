@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'sweasy.settings')
 
 application = get_wsgi_application()
+
+from sweasy import hashers  # noqa: E402
+
+# Calibrate the password hasher and load the password validators at startup.
+hashers.warm_up()